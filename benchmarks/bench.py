@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for ``Simulation.run``.
+
+Every configuration runs in a fresh process and reports rounds/sec, the
+memory traced by ``tracemalloc`` per round and the process' peak RSS.
+Results are written as JSON and can be compared against a saved baseline:
+
+    python benchmarks/bench.py --save-baseline          # record benchmarks/baseline.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+
+A configuration regresses when it is slower, or allocates or retains more,
+than the baseline by more than the given thresholds; the exit code is then 1.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from time import perf_counter
+from typing import NamedTuple
+
+from jackblack import Simulation, Player, Shoe, Strategy, Simple, Simple17, SPLIT
+
+### STRATEGIES
+class MultiHand(Simple):
+    def decide_hands(self, player) -> int:
+        return 3
+
+class SplitHeavy(Simple):
+    def decide(self, player, choices, dealer=None, players=[]) -> str:
+        if SPLIT in choices:
+            return SPLIT
+        return super().decide(player=player, choices=choices, dealer=dealer, players=players)
+
+STRATEGIES:dict[str,type[Strategy]] = {
+    "simple": Simple,
+    "simple17": Simple17,
+    "multihand": MultiHand,
+    "splitheavy": SplitHeavy,
+}
+
+### CONFIGURATIONS
+class BenchConfig(NamedTuple):
+    players:int = 1
+    decks:int = 8
+    strategy:str = "simple"
+    hit_on_soft_17:bool = False
+
+    @property
+    def name(self) -> str:
+        h17 = "h17" if self.hit_on_soft_17 else "s17"
+        return f"{self.strategy}-p{self.players}-d{self.decks}-{h17}"
+
+PLAYERS = [1, 2, 3, 4, 5, 6, 7]
+DECKS = [1, 2, 4, 6, 8]
+
+def standard_configs() -> list[BenchConfig]:
+    """One axis at a time around the default table (1 player, 8 decks, Simple, S17)."""
+    base = BenchConfig()
+    configs = [base]
+    configs += [base._replace(players=n) for n in PLAYERS if n != base.players]
+    configs += [base._replace(decks=n) for n in DECKS if n != base.decks]
+    configs += [base._replace(strategy=name) for name in STRATEGIES if name != base.strategy]
+    configs += [base._replace(hit_on_soft_17=True)]
+    # the heavy end of every axis together
+    configs += [BenchConfig(players=7, decks=1, strategy=name, hit_on_soft_17=True) for name in ("multihand", "splitheavy")]
+    return configs
+
+def full_configs() -> list[BenchConfig]:
+    return [
+        BenchConfig(players=players, decks=decks, strategy=strategy, hit_on_soft_17=h17)
+        for players in PLAYERS
+        for decks in DECKS
+        for strategy in STRATEGIES
+        for h17 in (False, True)
+    ]
+
+### MEASUREMENT
+def _simulation(config:BenchConfig, seed:int=0) -> Simulation:
+    players = [
+        Player(f"P{i}", chips=10**12, strategy=STRATEGIES[config.strategy](auto_log=False))
+        for i in range(config.players)
+    ]
+    sim = Simulation(players=players, deck=Shoe(num_decks=config.decks, seed=seed), hit_on_soft_17=config.hit_on_soft_17)
+    sim.rng.seed(seed)
+    return sim
+
+def measure(config:BenchConfig, rounds:int=2000, traced_rounds:int=500, repeat:int=3) -> dict:
+    """Benchmark one configuration in the current process."""
+    sim = _simulation(config)
+    sim.run(n_times=min(rounds, 200))   # warm up
+
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        sim.run(n_times=rounds)
+        elapsed = perf_counter() - start
+        best = elapsed if best == None else min(best, elapsed)
+
+    sim = _simulation(config)
+    sim.run(n_times=min(traced_rounds, 200))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.reset_peak()
+    sim.run(n_times=traced_rounds)
+    (current, peak) = tracemalloc.get_traced_memory()
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+
+    return {
+        "config": config._asdict(),
+        "rounds": rounds,
+        "rounds_per_sec": rounds / best,
+        # live memory left behind per round; anything above zero grows with run length
+        "retained_bytes_per_round": (current - before) / traced_rounds,
+        "retained_blocks_per_round": blocks / traced_rounds,
+        # high-water mark of traced memory above the starting point
+        "peak_traced_bytes": peak - before,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+def _peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def run_suite(configs:list[BenchConfig], rounds:int=2000, traced_rounds:int=500, repeat:int=3, verbose:bool=True) -> dict:
+    results = {}
+    # a fresh interpreter per configuration keeps peak RSS and allocator state independent
+    context = get_context("spawn")
+    for config in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(measure, config, rounds, traced_rounds, repeat).result()
+        results[config.name] = result
+        if verbose:
+            print(_format_result(config.name, result))
+    return {"meta": _meta(rounds=rounds, traced_rounds=traced_rounds, repeat=repeat), "results": results}
+
+def _meta(**settings) -> dict:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        **settings,
+    }
+
+def _format_result(name:str, result:dict) -> str:
+    return (
+        f"{name:<32} {result['rounds_per_sec']:>10.0f} rounds/s"
+        f" {result['retained_bytes_per_round']:>9.1f} B/round retained"
+        f" {result['peak_traced_bytes'] / 1024:>9.1f} KiB peak traced"
+        f" {result['peak_rss_kb'] / 1024:>7.1f} MiB peak RSS"
+    )
+
+### BASELINE COMPARISON
+class Thresholds(NamedTuple):
+    # relative slowdown of rounds/sec
+    speed:float = 0.10
+    # relative growth of peak traced memory & peak RSS
+    memory:float = 0.20
+    # absolute growth of retained bytes per round
+    retained_bytes:float = 16.0
+
+class Regression(NamedTuple):
+    name:str
+    metric:str
+    baseline:float
+    current:float
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.metric} {self.baseline:.1f} -> {self.current:.1f}"
+
+DEFAULT_THRESHOLDS = Thresholds()
+
+def compare(current:dict, baseline:dict, thresholds:Thresholds=DEFAULT_THRESHOLDS) -> list[Regression]:
+    """Regressions of ``current`` against ``baseline``, for configurations found in both."""
+    regressions = []
+    for (name, result) in current["results"].items():
+        base = baseline["results"].get(name)
+        if base == None:
+            continue
+        if result["rounds_per_sec"] < base["rounds_per_sec"] * (1 - thresholds.speed):
+            regressions.append(Regression(name, "rounds_per_sec", base["rounds_per_sec"], result["rounds_per_sec"]))
+        for metric in ("peak_traced_bytes", "peak_rss_kb"):
+            if result[metric] > base[metric] * (1 + thresholds.memory):
+                regressions.append(Regression(name, metric, base[metric], result[metric]))
+        if result["retained_bytes_per_round"] > base["retained_bytes_per_round"] + thresholds.retained_bytes:
+            regressions.append(Regression(name, "retained_bytes_per_round", base["retained_bytes_per_round"], result["retained_bytes_per_round"]))
+    return regressions
+
+### CLI
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Simulation.run across table configurations")
+    parser.add_argument("--full", action="store_true", help="Run every combination instead of one axis at a time")
+    parser.add_argument("--rounds", type=int, default=2000, help="Timed rounds per configuration (default: 2000)")
+    parser.add_argument("--traced-rounds", type=int, default=500, help="Rounds run under tracemalloc (default: 500)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions, the fastest counts (default: 3)")
+    parser.add_argument("--filter", default="", help="Only run configurations whose name contains this text")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {BASELINE_PATH}")
+    parser.add_argument("--speed-threshold", type=float, default=DEFAULT_THRESHOLDS.speed, help="Allowed relative rounds/sec drop (default: 0.10)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_THRESHOLDS.memory, help="Allowed relative memory growth (default: 0.20)")
+    parser.add_argument("--retained-threshold", type=float, default=DEFAULT_THRESHOLDS.retained_bytes, help="Allowed retained bytes/round growth (default: 16)")
+    args = parser.parse_args(argv)
+
+    configs = full_configs() if args.full else standard_configs()
+    configs = [config for config in configs if args.filter in config.name]
+    results = run_suite(configs, rounds=args.rounds, traced_rounds=args.traced_rounds, repeat=args.repeat)
+
+    for path in (args.output, BASELINE_PATH if args.save_baseline else None):
+        if path != None:
+            with open(path, "w") as file:
+                json.dump(results, file, indent=2)
+
+    if args.baseline != None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        thresholds = Thresholds(speed=args.speed_threshold, memory=args.memory_threshold, retained_bytes=args.retained_threshold)
+        regressions = compare(results, baseline, thresholds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
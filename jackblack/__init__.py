@@ -9,17 +9,21 @@ __author__ = "Michael Munson"
 __email__ = "michaelmunsonm@gmail.com"
 
 # Import main classes for easy access
-from .game import Game, Simulation
+from .engine import Simulation
+from .compare import Comparison
 from .player import Player, Dealer, Strategy, Simple, Simple17
-from .deck import Deck, Hand, Card
+from .basic import BasicStrategy
+from .deck import Deck, Shoe, Hand, Card
 
 # Import constants
 from .player import HIT, STAY, INSURANCE, DOUBLE_DOWN, SPLIT
+from .player import ACT_STAY, ACT_HIT, ACT_DOUBLE_DOWN, ACT_SPLIT, ACT_INSURANCE
 
 __all__ = [
     # Game classes
     "Game",
     "Simulation",
+    "Comparison",
     
     # Player classes
     "Player",
@@ -27,9 +31,11 @@ __all__ = [
     "Strategy",
     "Simple",
     "Simple17",
+    "BasicStrategy",
     
     # Deck classes
     "Deck",
+    "Shoe",
     "Hand", 
     "Card",
     
@@ -39,4 +45,16 @@ __all__ = [
     "INSURANCE",
     "DOUBLE_DOWN",
     "SPLIT",
+    "ACT_STAY",
+    "ACT_HIT",
+    "ACT_DOUBLE_DOWN",
+    "ACT_SPLIT",
+    "ACT_INSURANCE",
 ]
+
+def __getattr__(name):
+    # the interactive Game pulls in the terminal renderer, so only load it on use
+    if name == "Game":
+        from .game import Game
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,175 @@
+"""
+Exact expected values of player decisions.
+
+``Analyzer`` prices STAY, HIT, DOUBLE_DOWN and SPLIT for a hand against an
+upcard and the shoe composition, by memoized recursion over the player's
+hand states on top of ``jackblack.probability``. Hands are settled the way
+``Table`` settles them by default: no dealer peek, a natural wins half the
+bet (``blackjack_payout=0.5``, net +0.5 units) unless the dealer busts and
+pays 1:1, and a two card 21 after a split counts as a natural.
+
+Memo tables can be persisted with ``save()`` so later runs start warm.
+"""
+from __future__ import annotations
+import os
+import pickle
+from .deck import Card
+from .player import HIT, STAY, DOUBLE_DOWN, SPLIT
+from .probability import ACE, DealerOdds, DealerProbabilities, card_index, remove_cards, shoe_composition, _take
+
+### DECISION VALUES
+class DecisionValues(dict[str,float]):
+    """Expected net per unit bet of every legal decision."""
+    def best(self) -> str:
+        return max(self, key=self.get)
+
+### ANALYZER
+class Analyzer:
+    hit_on_soft_17:bool
+    cache_path:str
+    dealer:DealerOdds
+
+    def __init__(self, hit_on_soft_17:bool=False, cache_path:str=None) -> None:
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.cache_path = cache_path
+        self.dealer = DealerOdds(hit_on_soft_17=hit_on_soft_17)
+        # (composition, upcard, hard, has_ace) -> EV of playing on with hit/stay
+        self._best = {}
+        if cache_path != None and os.path.exists(cache_path):
+            self.load()
+
+    def evaluate(self, hand:list[Card], upcard:Card|int, composition:tuple[int, ...]=None, num_decks:int=8) -> DecisionValues:
+        """
+        EV of each legal decision for ``hand`` against ``upcard``. The
+        ``composition`` excludes the player's cards and the upcard but still
+        holds the unseen hole card; by default it is a full ``num_decks`` shoe.
+        """
+        cards = list(hand)
+        if composition == None:
+            composition = remove_cards(shoe_composition(num_decks), upcard, *cards)
+        composition = tuple(composition)
+        up = card_index(upcard)
+        indexes = [card_index(card) for card in cards]
+        hard = sum(i + 1 for i in indexes)
+        has_ace = ACE in indexes
+        if hard > 21:
+            raise ValueError(f"Hand {cards} is already bust")
+
+        values = DecisionValues()
+        values[STAY] = self._stand(composition, up, hard, has_ace, natural=len(cards) == 2)
+        if _total(hard, has_ace) < 21:
+            values[HIT] = self._hit(composition, up, hard, has_ace)
+        if len(cards) == 2:
+            values[DOUBLE_DOWN] = self._double(composition, up, hard, has_ace)
+            if indexes[0] == indexes[1]:
+                values[SPLIT] = 2 * self._split_hand(composition, up, indexes[0])
+        return values
+
+    def best(self, hand:list[Card], upcard:Card|int, composition:tuple[int, ...]=None, num_decks:int=8) -> str:
+        return self.evaluate(hand, upcard, composition=composition, num_decks=num_decks).best()
+
+    # standing on a finished hand
+    def _stand(self, composition:tuple[int, ...], up:int, hard:int, has_ace:bool, natural:bool=False) -> float:
+        dealer = self.dealer.probabilities(_upcard(up), composition)
+        total = _total(hard, has_ace)
+        if natural and total == 21:
+            return dealer.bust + 0.5 * (1 - dealer.bust - dealer.blackjack)
+        return _stand_ev(dealer, total)
+
+    # best of hitting & staying from here on
+    def _play(self, composition:tuple[int, ...], up:int, hard:int, has_ace:bool) -> float:
+        key = (composition, up, hard, has_ace)
+        ev = self._best.get(key)
+        if ev != None:
+            return ev
+        ev = self._stand(composition, up, hard, has_ace)
+        if _total(hard, has_ace) < 21:
+            ev = max(ev, self._hit(composition, up, hard, has_ace))
+        self._best[key] = ev
+        return ev
+
+    def _hit(self, composition:tuple[int, ...], up:int, hard:int, has_ace:bool) -> float:
+        n = sum(composition)
+        ev = 0.0
+        for (i, count) in enumerate(composition):
+            if count == 0:
+                continue
+            if hard + i + 1 > 21:
+                ev -= count / n
+            else:
+                ev += count / n * self._play(_take(composition, i), up, hard + i + 1, has_ace or i == ACE)
+        return ev
+
+    def _double(self, composition:tuple[int, ...], up:int, hard:int, has_ace:bool) -> float:
+        n = sum(composition)
+        ev = 0.0
+        for (i, count) in enumerate(composition):
+            if count == 0:
+                continue
+            if hard + i + 1 > 21:
+                ev -= count / n
+            else:
+                ev += count / n * self._stand(_take(composition, i), up, hard + i + 1, has_ace or i == ACE)
+        return 2 * ev
+
+    # one hand of a split pair: draw the second card, then hit, stay or double (no resplits)
+    def _split_hand(self, composition:tuple[int, ...], up:int, card:int) -> float:
+        n = sum(composition)
+        ev = 0.0
+        for (i, count) in enumerate(composition):
+            if count == 0:
+                continue
+            rest = _take(composition, i)
+            (hard, has_ace) = (card + i + 2, card == ACE or i == ACE)
+            best = max(
+                self._stand(rest, up, hard, has_ace, natural=True),
+                self._hit(rest, up, hard, has_ace) if _total(hard, has_ace) < 21 else -1.0,
+                self._double(rest, up, hard, has_ace)
+            )
+            ev += count / n * best
+        return ev
+
+    ### PERSISTENCE
+    def save(self, path:str=None) -> None:
+        path = path if path != None else self.cache_path
+        tables = {
+            "hit_on_soft_17": self.hit_on_soft_17,
+            "dealer_memo": self.dealer.memo,
+            "dealer_results": self.dealer.results,
+            "best": self._best,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(tables, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, path:str=None) -> None:
+        path = path if path != None else self.cache_path
+        with open(path, "rb") as file:
+            tables = pickle.load(file)
+        # tables for the other soft 17 rule are useless here
+        if tables["hit_on_soft_17"] != self.hit_on_soft_17:
+            return
+        self.dealer.memo.update(tables["dealer_memo"])
+        self.dealer.results.update(tables["dealer_results"])
+        self._best.update(tables["best"])
+
+    def clear(self) -> None:
+        self.dealer.clear()
+        self._best.clear()
+
+def _total(hard:int, has_ace:bool) -> int:
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+def _upcard(up:int) -> int:
+    # composition index back to a Card.value
+    return 11 if up == ACE else up + 1
+
+def _stand_ev(dealer:DealerProbabilities, total:int) -> float:
+    ev = dealer.bust - dealer.blackjack
+    for (dealer_total, p) in zip(range(17, 22), dealer[:5]):
+        if total > dealer_total:
+            ev += p
+        elif total < dealer_total:
+            ev -= p
+    return ev
@@ -0,0 +1,208 @@
+"""
+Table-driven basic strategy.
+
+Charts are for double-after-split, no-surrender games and are picked by the
+number of decks and the dealer's soft 17 rule. They are compiled once into
+a flat lookup, so every decision is a single list index.
+"""
+from __future__ import annotations
+from .player import Player, Dealer, Strategy, DecisionStates, HIT, STAY, DOUBLE_DOWN, SPLIT
+from .player import ACT_DOUBLE_DOWN, ACT_SPLIT, ACTIONS
+
+# chart codes
+H = "H"     # hit
+S = "S"     # stay
+D = "D"     # double, otherwise hit
+DS = "Ds"   # double, otherwise stay
+P = "P"     # split
+
+#          2  3  4  5  6  7  8  9  10 A
+HARD = {
+    8:  "H  H  H  H  H  H  H  H  H  H",
+    9:  "H  D  D  D  D  H  H  H  H  H",
+    10: "D  D  D  D  D  D  D  D  H  H",
+    11: "D  D  D  D  D  D  D  D  D  H",
+    12: "H  H  S  S  S  H  H  H  H  H",
+    13: "S  S  S  S  S  H  H  H  H  H",
+    14: "S  S  S  S  S  H  H  H  H  H",
+    15: "S  S  S  S  S  H  H  H  H  H",
+    16: "S  S  S  S  S  H  H  H  H  H",
+    17: "S  S  S  S  S  S  S  S  S  S",
+}
+SOFT = {
+    12: "H  H  H  H  H  H  H  H  H  H",
+    13: "H  H  H  D  D  H  H  H  H  H",
+    14: "H  H  H  D  D  H  H  H  H  H",
+    15: "H  H  D  D  D  H  H  H  H  H",
+    16: "H  H  D  D  D  H  H  H  H  H",
+    17: "H  D  D  D  D  H  H  H  H  H",
+    18: "S  Ds Ds Ds Ds S  S  H  H  H",
+    19: "S  S  S  S  S  S  S  S  S  S",
+}
+# keyed by the value of one card of the pair, "-" plays the pair as a total
+PAIRS = {
+    2:  "P  P  P  P  P  P  H  H  H  H",
+    3:  "P  P  P  P  P  P  H  H  H  H",
+    4:  "H  H  H  P  P  H  H  H  H  H",
+    5:  "-  -  -  -  -  -  -  -  -  -",
+    6:  "P  P  P  P  P  H  H  H  H  H",
+    7:  "P  P  P  P  P  P  H  H  H  H",
+    8:  "P  P  P  P  P  P  P  P  P  P",
+    9:  "P  P  P  P  P  S  P  P  S  S",
+    10: "-  -  -  -  -  -  -  -  -  -",
+    11: "P  P  P  P  P  P  P  P  P  P",
+}
+
+# (chart, total, upcard) -> code, differences from the 4-8 deck S17 charts
+DOUBLE_DECK = {
+    ("hard", 9, 2): D,
+    ("hard", 11, 11): D,
+    ("pair", 6, 7): P,
+    ("pair", 7, 8): P,
+}
+SINGLE_DECK = {
+    ("hard", 8, 5): D, ("hard", 8, 6): D,
+    ("hard", 9, 2): D,
+    ("hard", 11, 11): D,
+    ("soft", 13, 4): D, ("soft", 14, 4): D,
+    ("soft", 17, 2): D,
+    ("soft", 18, 11): S,
+    ("soft", 19, 6): DS,
+    ("pair", 3, 8): P,
+    ("pair", 4, 4): P,
+    ("pair", 6, 7): P,
+    ("pair", 7, 8): P, ("pair", 7, 10): S,
+}
+HIT_SOFT_17 = {
+    ("hard", 11, 11): D,
+    ("soft", 18, 2): DS,
+    ("soft", 19, 6): DS,
+}
+SINGLE_DECK_HIT_SOFT_17 = {
+    ("soft", 18, 11): H,
+}
+
+UPCARDS = range(2, 12)
+HARD_KIND, SOFT_KIND, PAIR_KIND = range(3)
+
+def basic_charts(num_decks:int=8, hit_on_soft_17:bool=False) -> dict[str, dict[int, list[str]]]:
+    """Basic strategy charts for a rule set as ``{chart: {total: [code per upcard 2..11]}}``."""
+    charts = {
+        "hard": {total: row.split() for (total, row) in HARD.items()},
+        "soft": {total: row.split() for (total, row) in SOFT.items()},
+        "pair": {value: row.split() for (value, row) in PAIRS.items()},
+    }
+    changes = {}
+    if num_decks == 1:
+        changes.update(SINGLE_DECK)
+    elif num_decks == 2:
+        changes.update(DOUBLE_DECK)
+    if hit_on_soft_17:
+        changes.update(HIT_SOFT_17)
+        if num_decks == 1:
+            changes.update(SINGLE_DECK_HIT_SOFT_17)
+    for ((chart, total, upcard), code) in changes.items():
+        charts[chart][total][upcard - 2] = code
+    return charts
+
+def _chart_code(charts:dict, kind:int, value:int, upcard:int) -> str:
+    # pairs are looked up by the value of one card
+    if kind == PAIR_KIND:
+        code = charts["pair"][value][upcard - 2]
+        if code != "-":
+            return code
+        (kind, value) = (HARD_KIND, 2 * value)
+    if kind == SOFT_KIND:
+        soft = charts["soft"]
+        return soft[min(max(value, 12), 19)][upcard - 2] if value >= 12 else H
+    hard = charts["hard"]
+    return hard[min(max(value, 8), 17)][upcard - 2]
+
+def _index(can_double:bool, kind:int, value:int, upcard:int) -> int:
+    return ((can_double * 3 + kind) * 22 + value) * 12 + upcard
+
+### BASIC STRATEGY
+class BasicStrategy(Strategy):
+    """
+    Basic strategy for ``num_decks`` and the dealer's soft 17 rule. Never
+    takes insurance; bets and hands are the ``Strategy`` defaults.
+    """
+    num_decks:int
+    hit_on_soft_17:bool
+
+    def __init__(self, num_decks:int=8, hit_on_soft_17:bool=False, auto_log:bool=True) -> None:
+        self.num_decks = num_decks
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.charts = basic_charts(num_decks=num_decks, hit_on_soft_17=hit_on_soft_17)
+        self._decisions = self._compile()
+        self._actions = [ACTIONS[decision] for decision in self._decisions]
+        super().__init__(auto_log=auto_log)
+
+    # chart answers are always legal, unless a subclass changes decide()
+    @property
+    def trusted(self) -> bool:
+        return type(self).decide is BasicStrategy.decide
+
+    # one chart lookup is cheaper through the trusted per-hand path than
+    # through decision waves, so only batch when a subclass asks for it
+    def batches(self) -> bool:
+        return type(self).decide_batch is not BasicStrategy.decide_batch
+
+    def _compile(self) -> list[str]:
+        decisions = [STAY] * _index(True, PAIR_KIND + 1, 0, 0)
+        for can_double in (False, True):
+            for kind in (HARD_KIND, SOFT_KIND, PAIR_KIND):
+                for value in (range(2, 12) if kind == PAIR_KIND else range(2, 22)):
+                    for upcard in UPCARDS:
+                        code = _chart_code(self.charts, kind, value, upcard)
+                        if code == P:
+                            decision = SPLIT
+                        elif code == H:
+                            decision = HIT
+                        elif code == D:
+                            decision = DOUBLE_DOWN if can_double else HIT
+                        elif code == DS:
+                            decision = DOUBLE_DOWN if can_double else STAY
+                        else:
+                            decision = STAY
+                        decisions[_index(can_double, kind, value, upcard)] = decision
+        return decisions
+
+    def decide(self, player:Player, choices:list[str], dealer:Dealer=None, players:list[Player]=[]) -> str:
+        hand = player.hand
+        if SPLIT in choices:
+            return self._decisions[_index(DOUBLE_DOWN in choices, PAIR_KIND, hand[0].value, dealer.showing())]
+        kind = SOFT_KIND if hand.is_soft() else HARD_KIND
+        return self._decisions[_index(DOUBLE_DOWN in choices, kind, hand.value(), dealer.showing())]
+
+    def decide_action(self, player:Player, legal:int, dealer:Dealer=None, table:list[Player]=[]) -> int:
+        hand = player.hand
+        can_double = legal & ACT_DOUBLE_DOWN != 0
+        if legal & ACT_SPLIT:
+            return self._actions[_index(can_double, PAIR_KIND, hand[0].value, dealer.showing())]
+        kind = SOFT_KIND if hand.is_soft() else HARD_KIND
+        return self._actions[_index(can_double, kind, hand.value(), dealer.showing())]
+
+    def decide_batch(self, states:DecisionStates) -> list[str]:
+        decisions = self._decisions
+        upcard = states.upcard
+        return [
+            decisions[
+                _index(DOUBLE_DOWN in choices, PAIR_KIND, player.hand[0].value, upcard) if SPLIT in choices
+                else _index(DOUBLE_DOWN in choices, SOFT_KIND if soft else HARD_KIND, value, upcard)
+            ]
+            for (player, choices, value, soft) in zip(states.players, states.choices, states.values, states.soft)
+        ]
+
+    def hit_table(self) -> list[list[list[bool]]]:
+        """Hit/stand-only view of the charts for ``jackblack.fast``: doubles fall back and pairs play as totals."""
+        return [
+            [
+                [
+                    2 <= value and 2 <= upcard and self._decisions[_index(False, kind, value, upcard)] == HIT
+                    for upcard in range(12)
+                ]
+                for value in range(22)
+            ]
+            for kind in (HARD_KIND, SOFT_KIND)
+        ]
@@ -7,8 +7,17 @@ import argparse
 import sys
 from .game import Simulation, Game
 from .player import Player, Simple, Simple17
+from .basic import BasicStrategy
 
 def main():
+    # subcommands run their own parsers
+    if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        from .sweep import main as sweep_main
+        sys.exit(sweep_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .serve import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="BlackJack Simulator - Run simulations with different strategies"
     )
@@ -38,7 +47,7 @@ def main():
     )
     parser.add_argument(
         "--strategy", 
-        choices=["simple", "simple17"], 
+        choices=["simple", "simple17", "basic"], 
         default="simple",
         help="Strategy to use (default: simple)"
     )
@@ -59,6 +68,7 @@ def main():
     strategy_map = {
         "simple": Simple(),
         "simple17": Simple17(),
+        "basic": BasicStrategy(),
     }
     strategy = strategy_map[args.strategy]
 
@@ -0,0 +1,116 @@
+"""
+Common-random-numbers comparison of strategies.
+
+Every strategy plays each round from an identical shoe (and ``player.rng``)
+state, so the per-round difference between two strategies only
+reflects the decisions they made, not the cards they happened to get.
+"""
+from __future__ import annotations
+from math import sqrt
+from typing import NamedTuple
+from .deck import Deck, Shoe
+from .engine import Simulation
+from .player import Player, Strategy
+from .stats import RunningStats
+
+### COMPARISON
+class Comparison:
+    strategies:dict[str,Strategy]
+    deck:Deck|Shoe
+    min_bet:int
+    hit_on_soft_17:bool
+    chips:int
+
+    def __init__(self, strategies:list[Strategy]|dict[str,Strategy], deck:Deck|Shoe=None, min_bet:int=15, hit_on_soft_17:bool=False, chips:int=10**9) -> None:
+        if not isinstance(strategies, dict):
+            strategies = _name_strategies(strategies)
+        if len(strategies) < 2:
+            raise ValueError("Comparison needs at least two strategies")
+        self.strategies = strategies
+        self.deck = deck if deck != None else Shoe(num_decks=8)
+        self.min_bet = min_bet
+        self.hit_on_soft_17 = hit_on_soft_17
+        # staked deep enough that nobody drops out and breaks the pairing
+        self.chips = chips
+
+    def run(self, n_times:int=1, seed:int=None) -> ComparisonResults:
+        if seed != None:
+            self.deck.reseed(seed)
+
+        names = list(self.strategies)
+        sims = [
+            Simulation(
+                players=[Player(name, chips=self.chips, strategy=self.strategies[name])],
+                deck=self.deck,
+                min_bet=self.min_bet,
+                hit_on_soft_17=self.hit_on_soft_17
+            )
+            for name in names
+        ]
+        if seed != None:
+            for sim in sims:
+                sim.rng.seed(seed)
+        stats = [RunningStats() for _ in names]
+        diffs = [RunningStats() for _ in names]
+        nets = [0.0] * len(names)
+
+        for _ in range(n_times):
+            deck_state = self.deck.getstate()
+            rng_state = sims[0].rng.getstate()
+            for (k, sim) in enumerate(sims):
+                if k > 0:
+                    self.deck.setstate(deck_state)
+                    sim.rng.setstate(rng_state)
+                game_results = sim._start()
+                nets[k] = game_results[0].net if len(game_results) > 0 else 0.0
+                stats[k].add(nets[k])
+            for k in range(1, len(names)):
+                diffs[k].add(nets[k] - nets[0])
+
+        return ComparisonResults(names=names, stats=stats, diffs=diffs, n_times=n_times)
+
+def _name_strategies(strategies:list[Strategy]) -> dict[str,Strategy]:
+    named = {}
+    for strategy in strategies:
+        name = type(strategy).__name__
+        i = 2
+        while name in named:
+            name = f"{type(strategy).__name__}{i}"
+            i += 1
+        named[name] = strategy
+    return named
+
+### COMPARISON RESULTS
+class StrategyComparison(NamedTuple):
+    name:str
+    rounds:int
+    mean:float
+    stderr:float
+    diff:float
+    diff_stderr:float
+    unpaired_stderr:float
+
+class ComparisonResults(dict[str,StrategyComparison]):
+    """
+    Per-round net for every strategy and its paired difference against the
+    first (baseline) strategy. ``unpaired_stderr`` is what the difference's
+    standard error would have been on independent shoes.
+    """
+    def __init__(self, names:list[str], stats:list[RunningStats], diffs:list[RunningStats], n_times:int) -> None:
+        self.baseline = names[0]
+        self.n_times = n_times
+        base = stats[0]
+        for (name, stat, diff) in zip(names, stats, diffs):
+            self[name] = StrategyComparison(
+                name=name,
+                rounds=stat.n,
+                mean=stat.mean,
+                stderr=stat.stderr(),
+                diff=diff.mean,
+                diff_stderr=diff.stderr(),
+                unpaired_stderr=sqrt(stat.stderr() ** 2 + base.stderr() ** 2) if name != self.baseline else 0.0
+            )
+
+    def print(self):
+        from .render import print_comparison_results
+        print_comparison_results(self)
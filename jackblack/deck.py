@@ -1,7 +1,11 @@
 from __future__ import annotations
 import random
+from array import array
 from typing import NamedTuple
 
+RANKS = ['Ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King']
+SUITS = ['❤️', '♦️', '♣︎', '♠︎']
+
 
 class Card:
     SYM_MAP = {
@@ -25,6 +29,8 @@ class Card:
             self.value = 11
         else:
             self.value = 10
+        # index into CARDS, rank major / suit minor
+        self.code = RANKS.index(self.rank) * 4 + SUITS.index(self.suit)
     
     def to_str(self) -> str:
         return f"{self.rank} {self.suit}"
@@ -41,11 +47,20 @@ class Card:
     def is_suit(suit:str) -> bool:
         return str.lower(suit) in ['hearts','diamonds','clubs','spades', '❤️', '♦️', '♣︎', '♠︎'] 
 
+# one shared (flyweight) card per rank & suit, indexed by Card.code
+CARDS:tuple[Card, ...] = tuple(Card(rank, suit) for rank in RANKS for suit in SUITS)
+
 class Hand(list[Card]):
     bet:int
+    # running totals, kept in step with the list by add()/clear() so that
+    # value(), lowest_value(), is_bust() and is_blackjack() never rescan
+    _hard:int
+    _aces:int
     
     def __init__(self, *cards:Card|str, bet:int=0):
         self.bet = bet
+        self._hard = 0
+        self._aces = 0
         for card in cards:
             self.add(card)
 
@@ -55,36 +70,111 @@ class Hand(list[Card]):
         elif isinstance(card,str):
             card = Card(card)
             return self.append(card)
-        
-    def value(self) -> int:
-        value = 0
+
+    def append(self, card:Card) -> None:
+        super().append(card)
+        if card.value == 11:
+            self._hard += 1
+            self._aces += 1
+        else:
+            self._hard += card.value
+
+    def clear(self) -> None:
+        super().clear()
+        self._hard = 0
+        self._aces = 0
+
+    def _recount(self) -> None:
+        self._hard = 0
+        self._aces = 0
         for card in self:
-            value += card.value
+            if card.value == 11:
+                self._hard += 1
+                self._aces += 1
+            else:
+                self._hard += card.value
+
+    def extend(self, cards) -> None:
+        super().extend(cards)
+        self._recount()
+
+    def insert(self, index, card:Card) -> None:
+        super().insert(index, card)
+        self._recount()
+
+    def pop(self, index=-1) -> Card:
+        card = super().pop(index)
+        self._recount()
+        return card
+
+    def remove(self, card:Card) -> None:
+        super().remove(card)
+        self._recount()
+
+    def __setitem__(self, index, card) -> None:
+        super().__setitem__(index, card)
+        self._recount()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._recount()
+
+    def __iadd__(self, cards) -> Hand:
+        self.extend(cards)
+        return self
+
+    def __imul__(self, n:int) -> Hand:
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    # new hands keep their totals (& the bet of the left hand) too
+    def __add__(self, cards) -> Hand:
+        hand = self.copy()
+        hand.extend(cards)
+        return hand
 
-        if value > 21:
-            i = 0
-            while i < len(self) and value > 21:
-                card = self[i]
-                if card.rank == "Ace":
-                    value -= 10
-                i += 1
+    def __mul__(self, n:int) -> Hand:
+        hand = self.copy()
+        hand *= n
+        return hand
 
-        return value
+    __rmul__ = __mul__
+
+    def copy(self) -> Hand:
+        return self.__copy__()
+
+    # copy & deepcopy would replay append() over the copied totals
+    def __copy__(self) -> Hand:
+        hand = type(self)(bet=self.bet)
+        hand.extend(self)
+        return hand
+
+    def __deepcopy__(self, memo:dict) -> Hand:
+        # cards never change (and are mostly CARDS flyweights), so they're shared
+        hand = memo[id(self)] = self.__copy__()
+        return hand
+        
+    def value(self) -> int:
+        # at most one ace can ever count as 11
+        if self._aces and self._hard <= 11:
+            return self._hard + 10
+        return self._hard
     
     def is_bust(self) -> int:
-        return self.value() > 21
+        return self._hard > 21
     
     def is_blackjack(self) -> int:
-        return len(self) == 2 and self.value() == 21
+        return len(self) == 2 and self._aces == 1 and self._hard == 11
+
+    def is_soft(self) -> bool:
+        return self._aces > 0 and self._hard <= 11
+
+    def is_pair(self) -> bool:
+        return len(self) == 2 and self[0].rank == self[1].rank
 
     def lowest_value(self) -> int:
-        value = 0
-        for card in self:
-            if card.rank == "Ace":
-                value += 1
-            else:
-                value += card.value
-        return value
+        return self._hard
 
     def to_str() -> str:
         return " | ".join(list(map(lambda card: card.to_str())))
@@ -98,34 +188,311 @@ class Hand(list[Card]):
             Hand(self[1])
         )
 
+# card counting tags by rank (Card.code >> 2): Ace, 2 ... 10, Jack, Queen, King
+HI_LO    = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+KO       = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1)
+OMEGA_II = (0, 1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2)
+ACES     = (1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+COUNT_SYSTEMS:dict[str,tuple[int, ...]] = {
+    "hi-lo": HI_LO,
+    "ko": KO,
+    "omega-ii": OMEGA_II,
+    "aces": ACES,
+}
+
+def _count_tags(counts:list[str]|dict[str,tuple[int, ...]]) -> list[tuple[str,tuple[int, ...]]]:
+    # names refer to COUNT_SYSTEMS, a dict brings its own tag tables
+    if isinstance(counts, dict):
+        return [(name, tuple(tags)) for (name, tags) in counts.items()]
+    return [(name, COUNT_SYSTEMS[name]) for name in counts]
+
+def _track(deck, counts:list[str]|dict[str,tuple[int, ...]], dealt) -> None:
+    # new systems start from the cards dealt since the last reset
+    for (name, tags) in _count_tags(counts):
+        if name in deck.counts:
+            continue
+        deck._tags.append((name, tags))
+        deck.counts[name] = sum(tags[code >> 2] for code in dealt())
+
+def _reveal(deck) -> None:
+    for code in deck._hidden:
+        for (name, tags) in deck._tags:
+            deck.counts[name] += tags[code >> 2]
+    deck._hidden.clear()
+
+def _cut(n_cards:int, penetration:float) -> int:
+    if not 0 < penetration <= 1:
+        raise ValueError("penetration must be in (0, 1]")
+    return int(n_cards * penetration)
+
+def _true_count(running:int, n_cards:int) -> float:
+    if n_cards == 0:
+        return 0.0
+    return running * 52 / n_cards
+
+def _composition(codes) -> tuple[int, ...]:
+    counts = [0] * 10
+    for code in codes:
+        counts[min(code >> 2, 9)] += 1
+    return tuple(counts)
+
 class Deck(list):
-    def __init__(self, num_decks:int=1, shuffle:bool=False):
+    def __init__(self, num_decks:int=1, shuffle:bool=False, counts:list[str]|dict[str,tuple[int, ...]]=(), penetration:float=1.0, burn:int=0, seed:int=None):
         self.num_decks = num_decks
         self.is_shuffle = shuffle
+        self.rng = random.Random(seed)
+        self._tags = _count_tags(counts)
+        self.counts = {}
+        # reshuffle between rounds once this many cards are gone
+        self.cut = _cut(52 * num_decks, penetration)
+        self.burn = burn
+        self._burned = []
+        # face-down cards, counted once they're revealed
+        self._hidden = []
         self.reset()
     # shuffle deck
     def shuffle(self):
-        random.shuffle(self)
+        self.rng.shuffle(self)
     # deal card
     def deal(self):
         if len(self) == 0:
             return None
-        return self.pop()
+        card = self.pop()
+        rank = card.code >> 2
+        for (name, tags) in self._tags:
+            self.counts[name] += tags[rank]
+        return card
+    # deal a face-down card, left out of the counts until reveal()
+    def deal_hole(self):
+        if len(self) == 0:
+            return None
+        card = self.pop()
+        self._hidden.append(card.code)
+        return card
+    # turn the face-down cards over
+    def reveal(self) -> None:
+        _reveal(self)
     # reset deck
     def reset(self):
         self.clear()
-        for i in range(self.num_decks):
-            self += [Card(rank, suit)
-                    for rank in ['Ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King']
-                    for suit in ['❤️', '♦️', '♣︎', '♠︎']]
-                    # for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']]
+        for _ in range(self.num_decks):
+            self.extend(CARDS)
+        self.counts = {name: 0 for (name, _) in self._tags}
+        self._hidden.clear()
         if self.shuffle:
             self.shuffle()
             self.shuffle()
+        # burned cards are never seen, so never counted
+        self._burned = [card.code for card in self[len(self) - self.burn:]]
+        del self[len(self) - self.burn:]
+    # restart from a fresh, seeded deck
+    def reseed(self, seed:int) -> None:
+        self.rng.seed(seed)
+        self.reset()
+    # called before every round: reshuffle once the cut card is out
+    def prepare_round(self) -> None:
+        if 52 * self.num_decks - len(self) >= self.cut:
+            self.reset()
+
+    # start keeping more count systems, see COUNT_SYSTEMS
+    def track(self, counts:list[str]|dict[str,tuple[int, ...]]) -> None:
+        _track(self, counts, self._dealt)
+
+    # codes of the cards dealt since the last reset
+    def _dealt(self) -> list[int]:
+        left = [0] * 52
+        for card in self:
+            left[card.code] += 1
+        for code in self._burned + self._hidden:
+            left[code] += 1
+        return [code for code in range(52) for _ in range(self.num_decks - left[code])]
+
+    # snapshot / restore the remaining cards, shuffle rng & counts
+    def getstate(self) -> tuple:
+        return (list(self), self.rng.getstate(), dict(self.counts), list(self._burned), list(self._hidden))
+
+    def setstate(self, state:tuple) -> None:
+        (cards, rng_state, counts, burned, hidden) = state
+        self[:] = cards
+        self.rng.setstate(rng_state)
+        self.counts = dict(counts)
+        self._burned = list(burned)
+        self._hidden = list(hidden)
+
+    # running count since the last reset
+    def running_count(self, system:str="hi-lo") -> int:
+        return self.counts[system]
+    # running count per deck left to deal
+    def true_count(self, system:str="hi-lo") -> float:
+        return _true_count(self.counts[system], len(self))
+
+    def decks_remaining(self) -> float:
+        return len(self) / 52
+
+    # remaining counts of Aces, 2-9 and tens, see jackblack.probability
+    def composition(self) -> tuple[int, ...]:
+        return _composition(card.code for card in self)
 
     def card_str_list(self):
         return list(map(lambda card: card.to_str(), self))
     
     def peek(self,num_cards:int):
         return list(map(lambda card: card.to_str(), self[-num_cards:]))
-    
\ No newline at end of file
+
+class Shoe:
+    """
+    Compact shoe. Cards are stored as ``Card.code`` bytes and dealt from a
+    cursor, handing out the shared ``CARDS`` flyweights. Every card stays in
+    the buffer, so ``reset()`` is just a rewind and an in-place shuffle.
+    Can be used anywhere a ``Deck`` is expected.
+
+    ``penetration`` places the cut card: once that share of the shoe is
+    dealt, it is reshuffled before the next round. ``continuous`` models a
+    continuous shuffling machine: every deal draws a random card from what
+    is left and the discards go back in before each round, with no shuffle.
+    """
+    num_decks:int
+    is_shuffle:bool
+    rng:random.Random
+    counts:dict[str,int]
+    cut:int
+    burn:int
+    continuous:bool
+
+    def __init__(self, num_decks:int=1, shuffle:bool=True, seed:int=None, counts:list[str]|dict[str,tuple[int, ...]]=(), penetration:float=1.0, burn:int=0, continuous:bool=False) -> None:
+        self.num_decks = num_decks
+        self.is_shuffle = shuffle
+        self.rng = random.Random(seed)
+        self._cards = array("B", range(52)) * num_decks
+        self._cursor = 0
+        # the cards from here up to the cursor have been seen
+        self._seen_from = 0
+        self._hidden = []
+        self._tags = _count_tags(counts)
+        self.counts = {}
+        self.cut = _cut(len(self._cards), penetration)
+        self.burn = burn
+        self.continuous = continuous
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._cards) - self._cursor
+
+    def __iter__(self):
+        for code in self._cards[self._cursor:]:
+            yield CARDS[code]
+
+    # shuffle the cards left in the shoe
+    def shuffle(self) -> None:
+        if self._cursor == 0:
+            self.rng.shuffle(self._cards)
+        else:
+            rest = self._cards[self._cursor:]
+            self.rng.shuffle(rest)
+            self._cards[self._cursor:] = rest
+    # deal card
+    def deal(self) -> Card|None:
+        cards = self._cards
+        cursor = self._cursor
+        if cursor >= len(cards):
+            return None
+        if self.continuous:
+            # draw-time Fisher-Yates step, so the shoe never needs a full shuffle
+            j = self.rng.randrange(cursor, len(cards))
+            (cards[cursor], cards[j]) = (cards[j], cards[cursor])
+        code = cards[cursor]
+        self._cursor = cursor + 1
+        rank = code >> 2
+        for (name, tags) in self._tags:
+            self.counts[name] += tags[rank]
+        return CARDS[code]
+    # deal a face-down card, left out of the counts until reveal()
+    def deal_hole(self) -> Card|None:
+        cards = self._cards
+        cursor = self._cursor
+        if cursor >= len(cards):
+            return None
+        if self.continuous:
+            j = self.rng.randrange(cursor, len(cards))
+            (cards[cursor], cards[j]) = (cards[j], cards[cursor])
+        self._cursor = cursor + 1
+        self._hidden.append(cards[cursor])
+        return CARDS[cards[cursor]]
+
+    def reveal(self) -> None:
+        _reveal(self)
+    # restart from a fresh, seeded shoe
+    def reseed(self, seed:int) -> None:
+        self.rng.seed(seed)
+        self._cards = array("B", range(52)) * self.num_decks
+        self.reset()
+    # return every card to the shoe
+    def reset(self) -> None:
+        self._cursor = 0
+        self.counts = {name: 0 for (name, _) in self._tags}
+        self._hidden.clear()
+        if self.is_shuffle and not self.continuous:
+            self.shuffle()
+        self._burn()
+    # called before every round
+    def prepare_round(self) -> None:
+        if self.continuous:
+            # discards & burned cards go back in, dealt cards are drawn at random anyway
+            self._cursor = 0
+            self._hidden.clear()
+            for name in self.counts:
+                self.counts[name] = 0
+            self._burn()
+        elif self._cursor >= self.cut:
+            self.reset()
+    # burned cards are never seen, so never counted
+    def _burn(self) -> None:
+        cards = self._cards
+        burn = min(self.burn, len(cards))
+        if self.continuous:
+            # an unshuffled buffer burns random cards, drawn like dealt ones
+            for cursor in range(burn):
+                j = self.rng.randrange(cursor, len(cards))
+                (cards[cursor], cards[j]) = (cards[j], cards[cursor])
+        self._cursor = self._seen_from = burn
+
+    def track(self, counts:list[str]|dict[str,tuple[int, ...]]) -> None:
+        _track(self, counts, self._dealt)
+
+    def _dealt(self) -> list[int]:
+        dealt = self._cards[self._seen_from:self._cursor].tolist()
+        for code in self._hidden:
+            dealt.remove(code)
+        return dealt
+
+    # snapshot / restore the card order, cursor, shuffle rng & counts
+    def getstate(self) -> tuple:
+        return (self._cards.tobytes(), self._cursor, self._seen_from, list(self._hidden), self.rng.getstate(), dict(self.counts))
+
+    def setstate(self, state:tuple) -> None:
+        (cards, self._cursor, self._seen_from, hidden, rng_state, counts) = state
+        self._hidden = list(hidden)
+        self._cards = array("B", cards)
+        self.rng.setstate(rng_state)
+        self.counts = dict(counts)
+
+    def running_count(self, system:str="hi-lo") -> int:
+        return self.counts[system]
+
+    def true_count(self, system:str="hi-lo") -> float:
+        return _true_count(self.counts[system], len(self))
+
+    def decks_remaining(self) -> float:
+        return len(self) / 52
+
+    # remaining counts of Aces, 2-9 and tens, see jackblack.probability
+    def composition(self) -> tuple[int, ...]:
+        return _composition(self._cards[self._cursor:])
+
+    # same orientation as Deck: the next card to be dealt comes last
+    def card_str_list(self) -> list[str]:
+        return [CARDS[code].to_str() for code in reversed(self._cards[self._cursor:])]
+
+    def peek(self, num_cards:int) -> list[str]:
+        return [CARDS[code].to_str() for code in reversed(self._cards[self._cursor:self._cursor + num_cards])]
@@ -0,0 +1,766 @@
+"""
+Headless round engine.
+
+``Table`` plays rounds without touching the terminal and ``Simulation`` runs
+it in a loop; the interactive ``Game`` and verbose simulations render on
+top of it through ``jackblack.render``.
+"""
+from __future__ import annotations
+from .deck import Deck, Shoe, Hand, Card
+from .player import Player, Dealer, Strategy, Simple, DecisionStates, PlayerResults, PlayerSimulationResults
+from .player import ACT_STAY, ACT_HIT, ACT_DOUBLE_DOWN, ACT_SPLIT, ACT_INSURANCE, ACTIONS, DECISION_ACTIONS, action_choices, _CHOICES
+from .stats import PlayerStats, z_score
+from .profiling import Profile
+from .history import HistoryWriter
+from .probability import DealerProbabilities, dealer_probabilities, add_cards
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+from functools import lru_cache
+from time import time
+from typing import NamedTuple
+import random
+
+### TABLE ###
+class Table:
+    """
+    Headless round engine shared by ``Game`` and ``Simulation``: dealing,
+    dealer play and settlement. Nothing here prints or reads input.
+    """
+    players: list[Player]
+    dealer: Dealer
+    deck: Deck
+    min_bet:int
+    log: Log
+    out_players: list[Player]
+
+    def __init__(self, players:list[Player], deck:Deck=Deck(shuffle=True, num_decks=8), min_bet:int=15, hit_on_soft_17:bool=False,
+                 blackjack_payout:float=0.5, steady:bool=False) -> None:
+        self.players = players
+        self.out_players = []
+        self.dealer = Dealer()
+        self.deck = deck
+        self.min_bet = min_bet
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.blackjack_payout = blackjack_payout
+        # seeded with the table, strategies draw from it as player.rng
+        self.rng = random.Random()
+        # reuse per-round buffers instead of building them every round, see _get_others
+        self.steady = steady
+        self._others = {}
+        self._choices = []
+        self._game_results = GameResults()
+        self.log = Log()
+        for player in players:
+            player.deck = deck
+            player.rng = self.rng
+            deck.track(player.strategy.counts)
+
+    def hit_player(self,player:Player) -> bool:
+        # if out of cards
+        if (len(self.deck) == 0):
+            self.deck.reset()
+        card = self.deck.deal()
+        return player.hit(card)
+
+    def add_player(self,player:Player) -> None:
+        player.deck = self.deck
+        player.rng = self.rng
+        self.deck.track(player.strategy.counts)
+        self.players.append(player)
+        self._others.clear()
+
+    def _check_player_chips(self):
+        for player in self.players:
+            if player.chips < self.min_bet:
+                self.out_players.append(player)
+        
+        for player in self.out_players:
+            if player in self.players:      
+                self.players.remove(player)
+                self._others.clear()
+
+    def _start_init_hit_round(self) -> None:
+        for k in range(2):
+            for player in self.players:
+                if player.has_pseudos():
+                    for pseudo in player.pseudos:
+                        # pseudo.hit(Card("9"))
+                        self.hit_player(player=pseudo)
+                else:
+                    # player.hit(Card("9"))
+                    self.hit_player(player=player)
+
+            if k == 0:
+                self.hit_player(player=self.dealer)
+            else:
+                self._deal_hole_card()
+            # self.dealer.hit(Card("9"))
+
+    def _deal_hole_card(self) -> None:
+        # face down, so counts only see it once the dealer plays
+        if (len(self.deck) == 0):
+            self.deck.reset()
+        self.dealer.hit(self.deck.deal_hole())
+
+    # string decisions, abbreviations included
+    def _handle_player_decision(self, player:Player, decision:str) -> None:
+        action = DECISION_ACTIONS.get(str.lower(decision))
+        if action != None:
+            self._handle_player_action(player=player, action=action)
+
+    def _handle_player_action(self, player:Player, action:int) -> None:
+        if action == ACT_STAY:
+            player.is_stayed = True
+        elif action == ACT_HIT:
+            self.hit_player(player=player)
+        elif action == ACT_DOUBLE_DOWN:
+            self._handle_player_double_down(player=player)
+        elif action == ACT_SPLIT:
+            player.split_hand()
+        elif action == ACT_INSURANCE:
+            player.place_insurance_bet()
+
+    def _handle_player_double_down(self, player:Player) -> None:
+        player.place_bet(bet_amount=player.bet)
+        self.hit_player(player=player)
+        player.is_stayed = True
+
+    def _start_dealer_hit_round(self) -> None:
+        self.deck.reveal()
+        if self.hit_on_soft_17:
+            while self.dealer.hand_value() < 17 or (self.dealer.hand_value() == 17 and self.dealer.hand.is_soft()):
+                self.hit_player(player=self.dealer)
+        else:
+            while self.dealer.hand_value() < 17:
+                self.hit_player(player=self.dealer)
+
+    def dealer_probabilities(self) -> DealerProbabilities:
+        """
+        Exact dealer outcome odds given the upcard, as seen from the table:
+        the hole card is still unknown, so it counts as part of the shoe.
+        """
+        hidden = self.deck.composition()
+        for card in self.dealer.hand[1:]:
+            hidden = add_cards(hidden, card)
+        return dealer_probabilities(self.dealer.hand[0], hidden, hit_on_soft_17=self.hit_on_soft_17)
+
+    def _get_results(self) -> GameResults:
+        if self.steady:
+            # overwritten by the next round
+            game_results = self._game_results
+            game_results.clear()
+        else:
+            game_results = GameResults()
+        # the dealer's outcome picks one row of the payout table for the whole round
+        dealer_state = _hand_state(self.dealer.hand)
+        payouts = self._payouts[dealer_state]
+        (ins_chips, ins_net) = INSURANCE_PAYOUTS[dealer_state]
+        for player in self.players:
+            (hands, won, pushed, busted, chips, net) = (0, 0, 0, 0, 0, 0)
+            # multiple / split hands, or the player's one hand
+            for hand in (player.pseudos or player._hands):
+                hands += 1
+                if hand.insurance > 0:
+                    chips += ins_chips * hand.insurance
+                    net += ins_net * hand.insurance
+                payout = payouts[_hand_state(hand.hand)]
+                won += payout.won
+                pushed += payout.pushed
+                busted += payout.busted
+                chips += payout.chips * hand.bet
+                net += payout.net * hand.bet
+            player.chips += chips
+
+            p_results = PlayerResults(player, hands, won, pushed, busted, net)
+            player.stats.add(hands, won, pushed, busted, net)
+            if player.keep_results:
+                player.results.append(p_results)
+            game_results.add(p_results)
+        return game_results
+
+    def _reset(self) -> None:
+        for player in self.players:
+            player.reset()
+            # strategy logs only keep the current round
+            if self.steady:
+                player.strategy.log.clear()
+        self.dealer.reset()
+        # cut card / continuous shuffle happen between rounds, not mid-hand
+        self.deck.prepare_round()
+
+    # winnings of a natural per unit bet, 0.5 pays 3:2
+    @property
+    def blackjack_payout(self) -> float:
+        return self._blackjack_payout
+
+    @blackjack_payout.setter
+    def blackjack_payout(self, blackjack_payout:float) -> None:
+        self._blackjack_payout = blackjack_payout
+        self._payouts = payout_table(blackjack_payout)
+
+    def _get_player_max_name_len(self) -> int:
+        max_len = len(self.dealer.name)
+        for player in self.players:
+            if player.has_pseudos():
+                for pseudo in player.pseudos:
+                    if len(pseudo.name) > max_len:
+                        max_len = len(pseudo.name)
+            else: 
+                if len(player.name) > max_len:
+                    max_len = len(player.name)
+        return max_len
+
+    def _is_all_players_bust(self) -> bool:
+        for player in self.players:
+            if not player.is_bust():
+                return False
+        return True
+
+### SIMULATION
+class Simulation(Table):
+    def __init__(self, players: list[Player], deck:Deck = Deck(shuffle=True, num_decks=8), min_bet:int = 15, hit_on_soft_17:bool=False,
+                 blackjack_payout:float=0.5, steady:bool=False) -> None:
+        super().__init__(players, deck, min_bet, hit_on_soft_17, blackjack_payout, steady)
+    
+    def run(self, n_times:int=1, print_sim:bool=False, wait:float=.01, workers:int=1, seed:int=None, profile:bool=False,
+            target:float=None, confidence:float=0.95, max_rounds:int=None, max_time:float=None, check_every:int=1000,
+            history:HistoryWriter=None, checkpoint:str=None, checkpoint_every:int=10000, resume:str=None) -> SimulationResults:
+        # snapshot to a file every checkpoint_every rounds, or carry on from one
+        if checkpoint != None or resume != None:
+            if workers > 1 or print_sim or profile or target != None or history != None:
+                raise ValueError("checkpoint and resume can't be combined with workers, print_sim, profile, target or history")
+            return self._run_checkpointed(n_times=n_times, checkpoint=checkpoint if checkpoint != None else resume,
+                                          checkpoint_every=checkpoint_every, resume=resume != None, seed=seed)
+
+        # record every round to a columnar history file
+        if history != None:
+            if workers > 1:
+                raise ValueError("history can't be combined with workers")
+            if seed != None and target == None:
+                # same cards as the unrecorded seeded run, but played on this table
+                _seed_simulation(self, _worker_seeds(seed=seed, workers=1)[0])
+                seed = None
+            with history.instrument(self):
+                return self.run(n_times=n_times, print_sim=print_sim, wait=wait, seed=seed, profile=profile, target=target,
+                                confidence=confidence, max_rounds=max_rounds, max_time=max_time, check_every=check_every)
+
+        # run until every player's EV per hand is known to within +/- target
+        if target != None:
+            if print_sim or profile or workers > 1:
+                raise ValueError("target can't be combined with print_sim, profile or workers")
+            return self._run_converged(target=target, confidence=confidence, max_rounds=max_rounds, max_time=max_time, check_every=check_every, seed=seed)
+
+        if workers > 1 or seed != None:
+            if print_sim or profile:
+                raise ValueError("print_sim and profile can't be combined with workers or seed")
+            return self._run_workers(n_times=n_times, workers=workers, seed=seed)
+
+        # timed phases & strategy callbacks
+        if profile:
+            if print_sim:
+                raise ValueError("print_sim can't be combined with profile")
+            return self._run_profiled(n_times=n_times)
+
+        # verbose runs are played by the terminal renderer
+        if print_sim:
+            from .render import run_verbose
+            return run_verbose(self, n_times=n_times, wait=wait)
+
+        start_time = time()
+        for i in range(n_times):
+            if len(self.players) < 1:
+                break
+            self._start()
+        time_elapsed = time() - start_time
+
+        return SimulationResults(players=self.players+self.out_players, n_times=n_times, time_elapsed=time_elapsed)
+
+    def start(self) -> GameResults:
+        return self._start()
+
+    def _run_converged(self, target:float, confidence:float=0.95, max_rounds:int=None, max_time:float=None, check_every:int=1000, seed:int=None) -> SimulationResults:
+        if target <= 0:
+            raise ValueError("target must be positive")
+        if seed != None:
+            # same cards as the plain seeded run
+            _seed_simulation(self, _worker_seeds(seed=seed, workers=1)[0])
+        # fail on a bad confidence before playing anything
+        z_score(confidence)
+        start_time = time()
+        rounds = 0
+        converged = False
+        while len(self.players) > 0:
+            batch = check_every if max_rounds == None else min(check_every, max_rounds - rounds)
+            if batch <= 0:
+                break
+            for i in range(batch):
+                if len(self.players) < 1:
+                    break
+                self._start()
+                rounds += 1
+            # a table everyone left hasn't converged
+            if len(self.players) < 1:
+                break
+            if all(player.stats.hand_ev_half_width(confidence) <= target for player in self.players):
+                converged = True
+                break
+            if max_time != None and time() - start_time >= max_time:
+                break
+        time_elapsed = time() - start_time
+
+        results = SimulationResults(players=self.players+self.out_players, n_times=rounds, time_elapsed=time_elapsed)
+        results.converged = converged
+        results.half_widths = {player.name: player.stats.hand_ev_half_width(confidence) for player in results.players}
+        return results
+
+    def _run_workers(self, n_times:int, workers:int, seed:int=None) -> SimulationResults:
+        start_time = time()
+        roster = self.players + self.out_players
+        # same seed & worker count -> same worker seeds & round split
+        seeds = _worker_seeds(seed=seed, workers=workers)
+        rounds = [n_times // workers + (1 if i < n_times % workers else 0) for i in range(workers)]
+
+        if workers == 1:
+            # one worker plays on this table, keeping its deck & strategy state
+            _seed_simulation(self, seeds[0])
+            self.run(n_times=n_times)
+            return SimulationResults(players=roster, n_times=n_times, time_elapsed=time() - start_time)
+
+        # workers play pickled clones: chips, stats & results come back, while the
+        # clones' decks and strategy state are discarded
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_worker, self, rounds[i], seeds[i]) for i in range(workers)]
+            worker_results = [future.result() for future in futures]
+
+        for worker_result in worker_results:
+            for (player, (chips, stats, results)) in zip(roster, worker_result):
+                player.chips += chips
+                player.stats.merge(stats)
+                player.results += [res._replace(player=player) for res in results]
+        self._check_player_chips()
+
+        time_elapsed = time() - start_time
+        return SimulationResults(players=roster, n_times=n_times, time_elapsed=time_elapsed)
+
+    def _run_checkpointed(self, n_times:int, checkpoint:str, checkpoint_every:int=10000, resume:bool=False, seed:int=None) -> SimulationResults:
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be positive")
+        start_time = time()
+        rounds = 0
+        if resume:
+            rounds = self.load_checkpoint(checkpoint)
+        elif seed != None:
+            # same cards as the plain seeded run, but played on this table
+            _seed_simulation(self, _worker_seeds(seed=seed, workers=1)[0])
+        while rounds < n_times and len(self.players) > 0:
+            batch = min(checkpoint_every, n_times - rounds)
+            for i in range(batch):
+                if len(self.players) < 1:
+                    break
+                # the round nobody could afford isn't played
+                if self._start():
+                    rounds += 1
+            self.save_checkpoint(checkpoint, rounds=rounds)
+        time_elapsed = time() - start_time
+
+        return SimulationResults(players=self.players+self.out_players, n_times=n_times, time_elapsed=time_elapsed)
+
+    def save_checkpoint(self, path:str, rounds:int=0) -> None:
+        """
+        Snapshot everything the next rounds depend on between two rounds: the
+        deck, the RNG, seats, chips, strategy ``state`` and statistics.
+        """
+        roster = self.players + self.out_players
+        # strategies can be shared between players, store each state once
+        strategies = []
+        for player in roster:
+            if not any(player.strategy is strategy for strategy in strategies):
+                strategies.append(player.strategy)
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "rounds": rounds,
+            "deck": self.deck.getstate(),
+            "random": self.rng.getstate(),
+            "players": [player.name for player in self.players],
+            "out_players": [player.name for player in self.out_players],
+            "chips": {player.name: (player.init_chips, player.chips) for player in roster},
+            "stats": {player.name: player.stats for player in roster},
+            "strategies": [strategy.state for strategy in strategies],
+            "strategy_index": {
+                player.name: next(k for (k, strategy) in enumerate(strategies) if player.strategy is strategy)
+                for player in roster
+            },
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path:str) -> int:
+        """Restore a ``save_checkpoint`` file onto this table, returns the rounds it had played."""
+        with open(path, "rb") as file:
+            checkpoint = pickle.load(file)
+        if checkpoint["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {checkpoint['version']}")
+        roster = {player.name: player for player in self.players + self.out_players}
+        if sorted(roster) != sorted(checkpoint["players"] + checkpoint["out_players"]):
+            raise ValueError(f"Checkpoint players {checkpoint['players'] + checkpoint['out_players']} don't match the table's {list(roster)}")
+
+        self.deck.setstate(checkpoint["deck"])
+        self.rng.setstate(checkpoint["random"])
+        self.players[:] = [roster[name] for name in checkpoint["players"]]
+        self.out_players[:] = [roster[name] for name in checkpoint["out_players"]]
+        self._others.clear()
+        for (name, player) in roster.items():
+            (player.init_chips, player.chips) = checkpoint["chips"][name]
+            player.stats = checkpoint["stats"][name]
+            player.strategy.state = checkpoint["strategies"][checkpoint["strategy_index"][name]]
+        return checkpoint["rounds"]
+
+    def _run_profiled(self, n_times:int) -> SimulationResults:
+        profile = Profile()
+        roster = self.players + self.out_players
+        start_time = time()
+        with profile.instrument([player.strategy for player in roster]), profile.instrument_table(self):
+            for i in range(n_times):
+                if len(self.players) < 1:
+                    break
+                self._start()
+                profile.rounds += 1
+        time_elapsed = time() - start_time
+        profile.time_elapsed = time_elapsed
+
+        return SimulationResults(players=roster, n_times=n_times, time_elapsed=time_elapsed, profile=profile)
+
+    def _start(self) -> GameResults:
+        self._reset()
+        #
+        self._check_player_chips()
+        # get hand & bet amount
+        self._handle_init_round_inputs()
+        # handle init hit rounds
+        self._start_init_hit_round()
+        # handle decision rounds
+        self._handle_decision_round()
+        # handle dealer hit round
+        self._start_dealer_hit_round()
+        #
+        self._handle_post_game_strat()
+
+        return self._get_results()
+    
+    def _handle_init_round_inputs(self) -> None:
+        for player in self.players:
+            n_hands = player.strategy.__decide_hands__(player=player)
+            p_bet = player.strategy.__decide_bet__(player=player, min_bet=self.min_bet)
+            if p_bet < self.min_bet:
+                p_bet = self.min_bet
+            if n_hands > 1:
+                player._handle_mult_hands(hand_amount=n_hands, bet_amount=p_bet)
+            else:
+                player.place_bet(p_bet, min_bet=self.min_bet)
+    
+    def _handle_decision_round(self) -> None:
+        # when every seat batches, strategies get every pending hand at once, in
+        # waves; otherwise seats keep playing in turn, so the cards they're dealt
+        # don't depend on how the other seats decide
+        for player in self.players:
+            if not player.strategy.batches():
+                break
+        else:
+            return self._handle_decision_waves()
+        i = 0
+        while i < len(self.players):
+            player = self.players[i]
+            i += 1
+        # for player in self.players:
+            if player.has_pseudos():
+                j = 0
+                while j < len(player.pseudos) :
+                    pseudo = player.pseudos[j]
+                    j+=1
+                    if pseudo.has_blackjack():
+                        self._handle_player_blackjack(player=pseudo)
+                        continue
+
+                    action = self._get_player_action(player=pseudo)
+                    if action & _DECIDE_AGAIN:
+                        j -= 1
+                    
+                    self._handle_player_action(player=pseudo, action=action)
+                    if pseudo.is_bust():
+                        j += 1
+            else:
+                if player.has_blackjack():
+                    self._handle_player_blackjack(player=player)
+                    continue
+        
+                action = self._get_player_action(player=player)
+                if action & _DECIDE_AGAIN:
+                    i -= 1
+                self._handle_player_action(player=player, action=action)
+                if player.is_bust():
+                    i += 1
+     
+    def _handle_decision_waves(self) -> None:
+        # each wave asks every unfinished hand for one decision, until none are left
+        pending = self._get_pending_hands(self._get_hands())
+        while pending:
+            is_split = False
+            for (hand, action) in zip(pending, self._get_player_actions(pending)):
+                self._handle_player_action(player=hand, action=action)
+                is_split = is_split or action == ACT_SPLIT
+            # splits replace hands, so look at the whole table again
+            pending = self._get_pending_hands(self._get_hands() if is_split else pending)
+
+    def _get_hands(self) -> list[Player]:
+        return [hand for player in self.players for hand in (player.pseudos or player._hands)]
+
+    def _get_pending_hands(self, hands:list[Player]) -> list[Player]:
+        pending = []
+        for hand in hands:
+            if hand.is_stayed or hand.hand.is_bust():
+                continue
+            if hand.hand.is_blackjack():
+                self._handle_player_blackjack(player=hand)
+                continue
+            pending.append(hand)
+        return pending
+
+    def _get_player_actions(self, hands:list[Player]) -> list[int]:
+        strategy = hands[0].strategy
+        # usually one (shared) strategy answers for every hand
+        if all(hand.strategy is strategy for hand in hands):
+            if strategy.batches():
+                return self._get_batch_actions(strategy, hands)
+            return [self._get_player_action(player=hand) for hand in hands]
+
+        actions = [0] * len(hands)
+        groups = {}
+        for (k, hand) in enumerate(hands):
+            groups.setdefault(id(hand.strategy), (hand.strategy, []))[1].append(k)
+        for (strategy, indexes) in groups.values():
+            if not strategy.batches():
+                for k in indexes:
+                    actions[k] = self._get_player_action(player=hands[k])
+                continue
+            for (k, action) in zip(indexes, self._get_batch_actions(strategy, [hands[k] for k in indexes])):
+                actions[k] = action
+        return actions
+
+    def _get_batch_actions(self, strategy:Strategy, hands:list[Player]) -> list[int]:
+        states = self._get_decision_states(hands)
+        if strategy.trusted:
+            return [DECISION_ACTIONS[decision] for decision in strategy.decide_batch(states)]
+        return [ACTIONS[decision] for decision in strategy.__decide_batch__(states)]
+
+    def _get_decision_states(self, players:list[Player]) -> DecisionStates:
+        choices = [self._get_valid_choices(player=player) for player in players]
+        values = [player.hand.value() for player in players]
+        soft = [player.hand.is_soft() for player in players]
+        return DecisionStates(players, choices, values, soft, self.dealer.showing(), self.dealer, self.players)
+
+    def _handle_player_blackjack(self, player:Player) -> None:
+        if player.has_blackjack():
+            # a split hand may already be insured from before the split
+            if self.dealer.showing_ace() and not player.has_insurance():
+                decision = self._get_player_decision(player=player, choices=["insurance","stay"])
+                self._handle_player_decision(player=player, decision=decision)
+            player.is_stayed = True
+
+    def _get_player_action(self, player:Player) -> int:
+        strategy = player.strategy
+        if strategy.trusted:
+            return strategy.decide_action(player, self._get_legal_actions(player=player), self.dealer, self.players)
+        if strategy.batches():
+            # outside of waves, a batch of one
+            return self._get_batch_actions(strategy, [player])[0]
+        return ACTIONS[self._get_player_decision(player=player)]
+
+    def _get_player_decision(self, player: Player, choices:list[str]=None) -> str:
+        if not choices:
+            if self.steady:
+                # refill one list rather than copying the choices every decision
+                choices = self._choices
+                choices[:] = _CHOICES[self._get_legal_actions(player=player)]
+            else:
+                choices = self._get_valid_choices(player=player)
+        decision = player.strategy.__decide__(player=player, choices=choices, dealer=self.dealer, players=self._get_others(player))
+        return decision
+
+    def _get_others(self, player:Player) -> list[Player]:
+        """
+        Everyone else at the table, as strategies get it. Steady tables hand
+        out one cached list per player until the seating changes, so
+        strategies must not modify it.
+        """
+        if not self.steady:
+            return [other for other in self.players if other != player]
+        others = self._others.get(id(player))
+        if others == None:
+            others = self._others[id(player)] = [other for other in self.players if other != player]
+        return others
+
+    def _get_valid_choices(self, player:Player) -> list[str]:
+        return action_choices(self._get_legal_actions(player=player))
+
+    def _get_legal_actions(self, player:Player) -> int:
+        legal = ACT_STAY | ACT_HIT
+
+        if len(player.hand) <= 2:
+            if (player.is_pseudo and player.parent.chips > player.bet) or player.chips > player.bet:
+                legal |= ACT_DOUBLE_DOWN
+            if player.can_split():
+                legal |= ACT_SPLIT
+
+        if self.dealer.hand[0].rank == "Ace":
+            if not player.has_insurance():
+                legal |= ACT_INSURANCE
+
+        return legal
+        
+    def _handle_post_game_strat(self) -> None:
+        for player in self.players:
+            player.strategy.__after__(player=player, players=self._get_others(player), dealer=self.dealer)
+
+# 2: deck states carry what has been seen since the shuffle, and the table's own rng
+CHECKPOINT_VERSION = 2
+
+### SETTLEMENT
+# hand states: totals 0-21, then these two
+BUST = 22
+NATURAL = 23
+
+class Payout(NamedTuple):
+    # chips paid back & net won, per unit bet
+    chips:float
+    net:float
+    won:int
+    pushed:int
+    busted:int
+
+def _hand_state(hand:Hand) -> int:
+    if hand.is_bust():
+        return BUST
+    if hand.is_blackjack():
+        return NATURAL
+    return hand.value()
+
+def _settle(state:int, dealer:int, blackjack_payout:float) -> Payout:
+    # the settlement rules, in order; no dealer peek, so a bust dealer pays naturals 1:1
+    if state == BUST:
+        return Payout(0, -1, 0, 0, 1)
+    if dealer == BUST:
+        return Payout(2, 1, 1, 0, 0)
+    if dealer == NATURAL:
+        return Payout(1, 0, 0, 1, 0) if state == NATURAL else Payout(0, -1, 0, 0, 0)
+    if state == NATURAL:
+        return Payout(1 + blackjack_payout, blackjack_payout, 1, 0, 0)
+    if state == dealer:
+        return Payout(1, 0, 0, 1, 0)
+    if state > dealer:
+        return Payout(2, 1, 1, 0, 0)
+    return Payout(0, -1, 0, 0, 0)
+
+@lru_cache(maxsize=None)
+def payout_table(blackjack_payout:float=0.5) -> tuple[tuple[Payout, ...], ...]:
+    """``Payout`` of every hand state, indexed ``[dealer state][hand state]``."""
+    return tuple(
+        tuple(_settle(state, dealer, blackjack_payout) for state in range(NATURAL + 1))
+        for dealer in range(NATURAL + 1)
+    )
+
+# insurance pays 2:1 on a dealer natural, (chips, net) per unit insured
+INSURANCE_PAYOUTS = tuple((2, 1) if dealer == NATURAL else (0, -1) for dealer in range(NATURAL + 1))
+
+# actions after which the same hand decides again
+_DECIDE_AGAIN = ACT_HIT | ACT_SPLIT | ACT_INSURANCE
+
+def _worker_seeds(seed:int, workers:int) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(63) for _ in range(workers)]
+
+def _seed_simulation(sim:Simulation, seed:int) -> None:
+    sim.rng.seed(seed)
+    sim.deck.reseed(seed)
+
+def _run_worker(sim:Simulation, n_times:int, seed:int) -> list[tuple[float, PlayerStats, list[PlayerResults]]]:
+    roster = sim.players + sim.out_players
+    init_chips = [player.chips for player in roster]
+    for player in roster:
+        player.stats = PlayerStats()
+        player.results = []
+
+    _seed_simulation(sim, seed)
+    sim.run(n_times=n_times)
+    return [(player.chips - chips, player.stats, player.results) for (player, chips) in zip(roster, init_chips)]
+
+### GAME RESULTS
+class GameResults(list[PlayerResults]):
+    def __init__(self) -> None:
+        super().__init__()
+    def add(self, player_res:PlayerResults) -> None:
+        return self.append(player_res)
+    def print(self) -> None:
+        from .render import print_game_results
+        print_game_results(self)
+
+### SIMULATION RESULTS
+class SimulationResults(dict[str,PlayerSimulationResults]):
+    stats:dict[str,PlayerStats]
+    time_elapsed:float
+    rounds_per_sec:float
+    profile:Profile|None
+    # set by runs with a target: stopped on the target (or on a budget) & final half-widths
+    converged:bool|None = None
+    half_widths:dict[str,float]|None = None
+
+    def __init__(self, players:list[Player], n_times:int, time_elapsed:float=0.0, profile:Profile=None) -> None:
+        self.players = players
+        self.n_times = n_times
+        self.time_elapsed = time_elapsed
+        self.rounds_per_sec = n_times / time_elapsed if time_elapsed > 0 else 0.0
+        self.profile = profile
+        self.update()
+
+    def update(self):
+        # snapshot the players' running totals
+        self.stats = {player.name: player.stats.copy() for player in self.players}
+        for player in self.players:
+            stats = self.stats[player.name]
+            self[player.name] = PlayerSimulationResults(
+                player=player,
+                rounds=self.n_times,
+                hands=stats.hands,
+                won=stats.won,
+                pushed=stats.pushed,
+                busted=stats.busted,
+                net=(player.chips - player.init_chips),
+                win_rate=stats.win_rate(),
+                net_mean=stats.round_net.mean,
+                net_stderr=stats.round_net.stderr()
+            )
+    
+    def print(self):
+        from .render import print_simulation_results
+        print_simulation_results(self)
+
+### LOG
+class Log(list[tuple[str,str]]):
+    def __init__(self) -> None:
+        pass
+
+    def add(self, log_item:str, style:str=""):
+        self.append((log_item, style))
+        
+    def delete(self, key:str):
+        for i in range(len(self)):
+            if self[i][0] == key:
+                del self[i]
+        
+    def print(self):
+        from .render import print_log
+        print_log(self)
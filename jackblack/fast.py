@@ -0,0 +1,333 @@
+"""
+Vectorized round engine for fixed hit/stand policies.
+
+Plays whole batches of rounds at once with NumPy: every round owns a row of
+a shoe matrix, and player / dealer totals are vectors that are advanced
+column-wise. Requires ``numpy`` (``pip install jackblack[fast]``).
+"""
+from __future__ import annotations
+import numpy as np
+from time import time
+from .player import Player, Strategy, Simple, Simple17
+from .engine import SimulationResults
+from .stats import PlayerStats, RunningStats
+
+# card values by rank, Ace counted as 1
+RANK_VALUES = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.int8)
+
+def policy_table(strategy:Strategy|np.ndarray) -> np.ndarray:
+    """
+    Boolean hit table indexed ``[soft, hand value, dealer upcard value]`` with
+    shape ``(2, 22, 12)``. The upcard axis uses ``Card.value`` (Ace = 11).
+
+    Strategies can provide their own table through a ``hit_table()`` method;
+    ``Simple`` and ``Simple17`` are translated from their thresholds.
+    """
+    if isinstance(strategy, np.ndarray):
+        table = strategy
+    elif hasattr(strategy, "hit_table"):
+        table = np.asarray(strategy.hit_table())
+    elif type(strategy).decide is Simple.decide:
+        table = _threshold_table(16)
+    elif type(strategy).decide is Simple17.decide:
+        table = _threshold_table(17)
+    else:
+        raise TypeError(f"{type(strategy).__name__} is not a fixed hit/stand policy.")
+
+    table = table.astype(bool)
+    if table.shape != (2, 22, 12):
+        raise ValueError(f"Hit table must have shape (2, 22, 12), got {table.shape}")
+    return table
+
+def _threshold_table(stand_on:int) -> np.ndarray:
+    table = np.zeros((2, 22, 12), dtype=bool)
+    table[:, :stand_on, :] = True
+    return table
+
+def _max_hand_cards(num_decks:int) -> int:
+    # the lowest cards of the shoe up to a hard 21, then one that busts the hand:
+    # 12 for one deck (A A A A 2 2 2 2 3 3 3 + 1), 22 from six decks on (21 aces + 1)
+    cards = np.sort(np.tile(np.repeat(RANK_VALUES, 4), num_decks))
+    return int(np.searchsorted(np.cumsum(cards), 21, side="right")) + 1
+
+class Shoes:
+    """
+    One shoe per row. Cards are drawn with an on-demand Fisher-Yates step, so
+    a row never has to be reshuffled up front; rewinding a row's cursor makes
+    it a freshly shuffled shoe again.
+    """
+    def __init__(self, n_shoes:int, num_decks:int, rng:np.random.Generator) -> None:
+        self.rng = rng
+        self.size = 52 * num_decks
+        self.cards = np.tile(np.repeat(RANK_VALUES, 4), (n_shoes, num_decks))
+        self.pos = np.zeros(n_shoes, dtype=np.intp)
+
+    def draw(self, rows:np.ndarray) -> np.ndarray:
+        pos = self.pos[rows]
+        # an empty shoe is reshuffled, like Table.hit_player does with an empty deck
+        pos[pos >= self.size] = 0
+        swap = self.rng.integers(pos, self.size)
+        card = self.cards[rows, swap]
+        self.cards[rows, swap] = self.cards[rows, pos]
+        self.cards[rows, pos] = card
+        self.pos[rows] = pos + 1
+        return card
+
+    def reset(self, rows:np.ndarray=None) -> None:
+        if rows is None:
+            self.pos[:] = 0
+        else:
+            self.pos[rows] = 0
+
+def _hand_values(hard:np.ndarray, aces:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    soft = aces & (hard <= 11)
+    return (hard + 10 * soft, soft)
+
+def deal(shoes:Shoes, rows:np.ndarray, n_seats:int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Deal two cards to every seat and then the dealer, seat by seat."""
+    hard = np.zeros((n_seats + 1, len(rows)), dtype=np.int16)
+    aces = np.zeros((n_seats + 1, len(rows)), dtype=bool)
+    up = None
+    for _ in range(2):
+        for seat in range(n_seats + 1):
+            card = shoes.draw(rows)
+            hard[seat] += card
+            aces[seat] |= (card == 1)
+            if seat == n_seats and up is None:
+                up = np.where(card == 1, 11, card).astype(np.intp)
+    return (hard, aces, up)
+
+def play_policy(shoes:Shoes, rows:np.ndarray, hard:np.ndarray, aces:np.ndarray, up:np.ndarray, table:np.ndarray) -> None:
+    """Hit every hand in place until the policy stands or the hand busts."""
+    natural = aces & (hard == 11)
+    active = np.nonzero(~natural)[0]
+    while len(active) > 0:
+        (value, soft) = _hand_values(hard[active], aces[active])
+        hit = (value <= 21) & table[soft.astype(np.intp), np.minimum(value, 21), up[active]]
+        active = active[hit]
+        if len(active) == 0:
+            break
+        card = shoes.draw(rows[active])
+        hard[active] += card
+        aces[active] |= (card == 1)
+
+def play_dealer(shoes:Shoes, rows:np.ndarray, hard:np.ndarray, aces:np.ndarray, hit_on_soft_17:bool=False) -> None:
+    """Draw to 17 in place, hitting soft 17 when the table says so."""
+    active = np.arange(len(rows))
+    while len(active) > 0:
+        (value, soft) = _hand_values(hard[active], aces[active])
+        hit = (value < 17)
+        if hit_on_soft_17:
+            hit |= (value == 17) & soft
+        active = active[hit]
+        if len(active) == 0:
+            break
+        card = shoes.draw(rows[active])
+        hard[active] += card
+        aces[active] |= (card == 1)
+
+def settle(hard:np.ndarray, aces:np.ndarray, natural:np.ndarray, d_hard:np.ndarray, d_aces:np.ndarray, d_natural:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Settle one seat against the dealer the same way ``Game._get_results`` does.
+    Returns ``(won, pushed, busted, net)`` where ``net`` is in units of the bet.
+    """
+    (value, _) = _hand_values(hard, aces)
+    (d_value, _) = _hand_values(d_hard, d_aces)
+    busted = value > 21
+    d_bust = d_value > 21
+    live = ~busted & ~d_bust
+    plain = live & ~d_natural & ~natural
+
+    won = ~busted & (d_bust | (~d_natural & natural) | (plain & (value > d_value)))
+    pushed = (live & d_natural & natural) | (plain & (value == d_value))
+
+    net = np.where(busted, -1.0, np.where(d_bust, 1.0, np.where(d_natural, np.where(natural, 0.0, -1.0), np.where(natural, .5, np.sign(value - d_value)))))
+    return (won, pushed, busted, net)
+
+### FAST SIMULATION
+class FastSimulation:
+    """
+    Batch counterpart of ``Simulation`` for fixed hit/stand policies.
+
+    Every player bets ``min_bet`` on a single hand each round and never
+    doubles, splits or takes insurance; chips never run out. Each round is
+    dealt from a freshly shuffled shoe.
+    """
+    players:list[Player]
+    num_decks:int
+    min_bet:int
+    hit_on_soft_17:bool
+    batch_size:int
+
+    def __init__(self, players:list[Player], num_decks:int=8, min_bet:int=15, hit_on_soft_17:bool=False, seed:int=None, batch_size:int=65536) -> None:
+        self.players = players
+        self.num_decks = num_decks
+        self.min_bet = min_bet
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.tables = [policy_table(player.strategy) for player in players]
+
+    def run(self, n_times:int=1) -> SimulationResults:
+        start_time = time()
+        shoes = Shoes(min(n_times, self.batch_size), self.num_decks, self.rng)
+        done = 0
+        while done < n_times:
+            n_rounds = min(self.batch_size, n_times - done)
+            self._run_batch(shoes, np.arange(n_rounds))
+            done += n_rounds
+
+        time_elapsed = time() - start_time
+        return SimulationResults(players=self.players, n_times=n_times, time_elapsed=time_elapsed)
+
+    def _run_batch(self, shoes:Shoes, rows:np.ndarray) -> None:
+        shoes.reset(rows)
+        n_seats = len(self.players)
+        (hard, aces, up) = deal(shoes, rows, n_seats)
+        natural = aces & (hard == 11)
+
+        for seat in range(n_seats):
+            play_policy(shoes, rows, hard[seat], aces[seat], up, self.tables[seat])
+        play_dealer(shoes, rows, hard[n_seats], aces[n_seats], self.hit_on_soft_17)
+
+        for (seat, player) in enumerate(self.players):
+            (won, pushed, busted, net) = settle(hard[seat], aces[seat], natural[seat], hard[n_seats], aces[n_seats], natural[n_seats])
+            net_chips = net * self.min_bet
+            stats = PlayerStats()
+            stats.rounds = stats.hands = len(rows)
+            stats.won = int(won.sum())
+            stats.pushed = int(pushed.sum())
+            stats.busted = int(busted.sum())
+            stats.net = float(net_chips.sum())
+            mean = stats.net / len(rows)
+            stats.round_net = RunningStats(len(rows), mean, float(((net_chips - mean) ** 2).sum()))
+            player.chips += stats.net
+            player.stats.merge(stats)
+
+### MULTI-TABLE SIMULATION
+class MultiTableSimulation:
+    """
+    Many independent tables advanced together, one round at a time. Every
+    table seats the same lineup (``players`` are the seats' names and
+    strategies) and keeps its own shoe across rounds: a row of the shared
+    ``Shoes`` whose cursor persists until the cut card, after which that
+    table reshuffles. Seats play like ``FastSimulation``: flat ``min_bet``
+    bets, fixed hit/stand policies, no doubles, splits or insurance.
+
+    Statistics are kept per table and seat in ``(seats, tables)`` arrays and
+    only turned into ``PlayerStats`` when a run ends.
+    """
+    players:list[Player]
+    n_tables:int
+    num_decks:int
+    min_bet:int
+    hit_on_soft_17:bool
+    cut:int
+
+    def __init__(self, players:list[Player], n_tables:int, num_decks:int=8, min_bet:int=15, hit_on_soft_17:bool=False, penetration:float=0.75, seed:int=None) -> None:
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.players = players
+        self.n_tables = n_tables
+        self.num_decks = num_decks
+        self.min_bet = min_bet
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.rng = np.random.default_rng(seed)
+        self.tables = [policy_table(player.strategy) for player in players]
+        self.shoes = Shoes(n_tables, num_decks, self.rng)
+        self.cut = int(self.shoes.size * penetration)
+        # cards a round can take at most, so a round never runs a shoe dry
+        self._reserve = _max_hand_cards(num_decks) * (len(players) + 1)
+        self.rows = np.arange(n_tables)
+        shape = (len(players), n_tables)
+        self.rounds = np.zeros(n_tables, dtype=np.int64)
+        self.won = np.zeros(shape, dtype=np.int64)
+        self.pushed = np.zeros(shape, dtype=np.int64)
+        self.busted = np.zeros(shape, dtype=np.int64)
+        # per-round net in units of the bet, summed & squared-summed
+        self.net = np.zeros(shape, dtype=np.float64)
+        self.net_sq = np.zeros(shape, dtype=np.float64)
+        # seat totals already merged into the seats' players
+        self._settled = [(0, 0, 0, 0, 0.0, 0.0)] * len(players)
+
+    def run(self, n_times:int=1) -> MultiTableResults:
+        """Play ``n_times`` rounds at every table."""
+        start_time = time()
+        for _ in range(n_times):
+            self._start()
+        time_elapsed = time() - start_time
+        return MultiTableResults(self, n_times=n_times * self.n_tables, time_elapsed=time_elapsed)
+
+    def _start(self) -> None:
+        shoes = self.shoes
+        rows = self.rows
+        n_seats = len(self.players)
+        # cut card reached, or not enough cards left for a whole round
+        shoes.reset(np.nonzero(shoes.pos >= min(self.cut, shoes.size - self._reserve))[0])
+        (hard, aces, up) = deal(shoes, rows, n_seats)
+        natural = aces & (hard == 11)
+
+        for seat in range(n_seats):
+            play_policy(shoes, rows, hard[seat], aces[seat], up, self.tables[seat])
+        play_dealer(shoes, rows, hard[n_seats], aces[n_seats], self.hit_on_soft_17)
+
+        for seat in range(n_seats):
+            (won, pushed, busted, net) = settle(hard[seat], aces[seat], natural[seat], hard[n_seats], aces[n_seats], natural[n_seats])
+            self.won[seat] += won
+            self.pushed[seat] += pushed
+            self.busted[seat] += busted
+            self.net[seat] += net
+            self.net_sq[seat] += net * net
+        self.rounds += 1
+
+    def _settle_players(self) -> None:
+        # merge what every table played since the last settlement, like FastSimulation
+        for (seat, player) in enumerate(self.players):
+            totals = self._seat_totals(seat)
+            stats = self._stats(*(total - settled for (total, settled) in zip(totals, self._settled[seat])))
+            self._settled[seat] = totals
+            player.chips += stats.net
+            player.stats.merge(stats)
+
+    def table_stats(self, table:int, seat:int) -> PlayerStats:
+        """Running totals of one seat at one table, in chips."""
+        return self._stats(self.rounds[table], self.won[seat, table], self.pushed[seat, table], self.busted[seat, table],
+                           self.net[seat, table], self.net_sq[seat, table])
+
+    def seat_stats(self, seat:int) -> PlayerStats:
+        """Running totals of one seat over every table, in chips."""
+        return self._stats(*self._seat_totals(seat))
+
+    def _seat_totals(self, seat:int) -> tuple:
+        return (int(self.rounds.sum()), int(self.won[seat].sum()), int(self.pushed[seat].sum()), int(self.busted[seat].sum()),
+                float(self.net[seat].sum()), float(self.net_sq[seat].sum()))
+
+    def _stats(self, rounds:int, won:int, pushed:int, busted:int, net:float, net_sq:float) -> PlayerStats:
+        rounds = int(rounds)
+        stats = PlayerStats()
+        stats.rounds = stats.hands = rounds
+        stats.won = int(won)
+        stats.pushed = int(pushed)
+        stats.busted = int(busted)
+        stats.net = float(net) * self.min_bet
+        if rounds > 0:
+            mean = float(net) / rounds
+            m2 = max(float(net_sq) - rounds * mean * mean, 0.0) * self.min_bet ** 2
+            stats.round_net = RunningStats(rounds, mean * self.min_bet, m2)
+        return stats
+
+class MultiTableResults(SimulationResults):
+    """
+    ``SimulationResults`` for every seat over all tables, plus per table
+    arrays shaped ``(seats, tables)`` (``won``, ``pushed``, ``busted`` and
+    ``net`` in chips) and ``rounds`` per table.
+    """
+    def __init__(self, sim:MultiTableSimulation, n_times:int, time_elapsed:float=0.0) -> None:
+        self.rounds = sim.rounds.copy()
+        self.won = sim.won.copy()
+        self.pushed = sim.pushed.copy()
+        self.busted = sim.busted.copy()
+        self.net = sim.net * sim.min_bet
+        self.table_stats = sim.table_stats
+        sim._settle_players()
+        super().__init__(players=sim.players, n_times=n_times, time_elapsed=time_elapsed)
@@ -0,0 +1,192 @@
+"""
+Columnar per-round hand histories.
+
+``HistoryWriter`` records one fixed-width row per seat and round while a
+``Simulation`` runs, buffering every column in an ``array`` and appending
+full chunks to one raw binary file per column. ``read_history`` maps those
+files as NumPy arrays (``pip install jackblack[fast]``) without parsing or
+copying them, so histories far larger than memory can be analyzed.
+
+    with HistoryWriter("history") as history:
+        sim.run(n_times=10_000_000, history=history)
+    columns = read_history("history")
+    columns["net"][columns["seat"] == 0].mean()
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+from .profiling import _patch, _unpatch
+
+# name, array typecode, numpy dtype
+COLUMNS = (
+    ("round", "q", "i8"),
+    ("seat", "h", "i2"),
+    # hands played by the seat, split & extra hands included
+    ("hands", "h", "i2"),
+    # cards held by all of the seat's hands at settlement
+    ("cards", "h", "i2"),
+    # Card.code of the first hand's first two cards, -1 if missing
+    ("first_card", "b", "i1"),
+    ("second_card", "b", "i1"),
+    ("upcard", "b", "i1"),
+    # every ACT_* action the seat took this round, or-ed together
+    ("actions", "B", "u1"),
+    ("dealer_total", "b", "i1"),
+    ("dealer_cards", "b", "i1"),
+    ("bet", "d", "f8"),
+    ("net", "d", "f8"),
+)
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+### WRITER
+class HistoryWriter:
+    path:str
+    chunk_rows:int
+    rows:int
+    rounds:int
+
+    def __init__(self, path:str, chunk_rows:int=1 << 16) -> None:
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.rounds = 0
+        # rows & rounds flushed to the column files
+        self._written = (0, 0)
+        self._buffers = {name: array(typecode) for (name, typecode, _) in COLUMNS}
+        # bound appends in COLUMNS order, for record()
+        self._appends = tuple(buffer.append for buffer in self._buffers.values())
+        os.makedirs(path, exist_ok=True)
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for (name, _, _) in COLUMNS}
+        # seat number by id(player) & actions taken this round by id(player)
+        self._seats = {}
+        self._actions = {}
+        self._write_meta()
+
+    @contextmanager
+    def instrument(self, table):
+        """Record every round ``table`` settles until the block exits."""
+        for player in table.players + table.out_players:
+            self._seats.setdefault(id(player), len(self._seats))
+        handle_action = table._handle_player_action
+        get_results = table._get_results
+        actions = self._actions
+
+        def recorded_action(player, action:int) -> None:
+            seat = player.parent if player.is_pseudo else player
+            actions[id(seat)] = actions.get(id(seat), 0) | action
+            handle_action(player=player, action=action)
+
+        def recorded_results():
+            game_results = get_results()
+            self.record(table, game_results)
+            return game_results
+
+        # instance attributes shadow the methods the round loop calls
+        patches = [
+            _patch(table, "_handle_player_action", recorded_action),
+            _patch(table, "_get_results", recorded_results),
+        ]
+        try:
+            yield self
+        finally:
+            _unpatch(patches)
+            self.flush()
+
+    def record(self, table, game_results) -> None:
+        """Append one row per seat of a settled round."""
+        (rounds, seats, hands_, cards, first_cards, second_cards, upcards, actions, dealer_totals, dealer_cards, bets, nets) = self._appends
+        dealer = table.dealer.hand
+        upcard = dealer[0].code if len(dealer) > 0 else -1
+        dealer_total = dealer.value()
+        for res in game_results:
+            player = res.player
+            hands = player.pseudos or player._hands
+            first = hands[0].hand
+            rounds(self.rounds)
+            seats(self._seats.setdefault(id(player), len(self._seats)))
+            hands_(res.hands)
+            cards(sum(len(hand.hand) for hand in hands) if player.pseudos else len(first))
+            first_cards(first[0].code if len(first) > 0 else -1)
+            second_cards(first[1].code if len(first) > 1 else -1)
+            upcards(upcard)
+            actions(self._actions.pop(id(player), 0))
+            dealer_totals(dealer_total)
+            dealer_cards(len(dealer))
+            bets(player.bet)
+            nets(res.net)
+        self.rows += len(game_results)
+        self.rounds += 1
+        if len(self._buffers["round"]) >= self.chunk_rows:
+            self._write_chunk()
+
+    def flush(self) -> None:
+        self._write_chunk()
+        for file in self._files.values():
+            file.flush()
+        self._written = (self.rows, self.rounds)
+        self._write_meta()
+
+    def close(self) -> None:
+        if self._files:
+            self.flush()
+            for file in self._files.values():
+                file.close()
+            self._files = {}
+
+    def __enter__(self) -> HistoryWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_chunk(self) -> None:
+        for (name, buffer) in self._buffers.items():
+            buffer.tofile(self._files[name])
+            del buffer[:]
+
+    def _write_meta(self) -> None:
+        (rows, rounds) = self._written
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": rows,
+            "rounds": rounds,
+            "byteorder": sys.byteorder,
+            "columns": {name: dtype for (name, _, dtype) in COLUMNS},
+        }
+        tmp_path = os.path.join(self.path, f"{META_FILE}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(meta, file)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+### READER
+class History(dict):
+    """NumPy arrays by column name, memory-mapped read-only."""
+    rows:int
+    rounds:int
+
+    def __init__(self, columns:dict, rows:int, rounds:int) -> None:
+        super().__init__(columns)
+        self.rows = rows
+        self.rounds = rounds
+
+def read_history(path:str) -> History:
+    import numpy as np
+    with open(os.path.join(path, META_FILE)) as file:
+        meta = json.load(file)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported history format {meta['version']}")
+    rows = meta["rows"]
+    order = "<" if meta["byteorder"] == "little" else ">"
+    columns = {}
+    for (name, dtype) in meta["columns"].items():
+        dtype = np.dtype(dtype).newbyteorder(order)
+        if rows == 0:
+            # empty files can't be mapped
+            columns[name] = np.empty(0, dtype=dtype)
+            continue
+        columns[name] = np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+    return History(columns, rows=rows, rounds=meta["rounds"])
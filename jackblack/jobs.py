@@ -0,0 +1,114 @@
+"""
+Simulations described as plain, JSON-able configurations.
+
+A job config names everything that decides a run's outcome (table rules,
+players, strategy and its parameters, rounds and seed), so a job can be
+shipped to another process and its results cached under ``config_key()``.
+"""
+from __future__ import annotations
+import hashlib
+import json
+from time import time
+from typing import Callable
+from . import __version__
+from .basic import BasicStrategy
+from .deck import Shoe
+from .engine import Simulation, SimulationResults, _seed_simulation, _worker_seeds
+from .player import Player, Strategy, Simple, Simple17
+
+# strategies jobs can name; register your own (defined at module level) here
+STRATEGIES:dict[str,type[Strategy]] = {
+    "simple": Simple,
+    "simple17": Simple17,
+    "basic": BasicStrategy,
+}
+
+DEFAULT_CONFIG = {
+    "rounds": 10000,
+    "seed": 0,
+    "min_bet": 15,
+    "num_decks": 8,
+    "hit_on_soft_17": False,
+    "blackjack_payout": 0.5,
+    "penetration": 1.0,
+    "players": 1,
+    "chips": 10**9,
+    "strategy": "simple",
+    "strategy_params": {},
+}
+
+def job_config(config:dict=None, **overrides) -> dict:
+    """``config`` and ``overrides`` on top of ``DEFAULT_CONFIG``, checked."""
+    job = {**DEFAULT_CONFIG, **(config or {}), **overrides}
+    unknown = set(job) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown job settings: {sorted(unknown)}")
+    if job["strategy"] not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{job['strategy']}', expected one of {sorted(STRATEGIES)}")
+    return job
+
+def config_key(config:dict) -> str:
+    """Hash of the full configuration (and library version) a job runs with."""
+    canonical = json.dumps({"version": __version__, **job_config(config)}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def make_strategy(config:dict) -> Strategy:
+    params = dict(config["strategy_params"])
+    strategy_class = STRATEGIES[config["strategy"]]
+    # basic strategy follows the table's rules unless told otherwise
+    if strategy_class is BasicStrategy:
+        params.setdefault("num_decks", config["num_decks"])
+        params.setdefault("hit_on_soft_17", config["hit_on_soft_17"])
+    return strategy_class(auto_log=False, **params)
+
+def make_simulation(config:dict) -> Simulation:
+    config = job_config(config)
+    players = [
+        Player(f"P{i + 1}", chips=config["chips"], strategy=make_strategy(config))
+        for i in range(config["players"])
+    ]
+    deck = Shoe(num_decks=config["num_decks"], penetration=config["penetration"])
+    return Simulation(players=players, deck=deck, min_bet=config["min_bet"], hit_on_soft_17=config["hit_on_soft_17"],
+                      blackjack_payout=config["blackjack_payout"])
+
+def run_job(config:dict, progress:Callable[[int], None]=None, progress_every:int=10000) -> dict:
+    """
+    Run one job and return its aggregated results as a JSON-able dict.
+    ``progress`` is called with the rounds played so far every
+    ``progress_every`` rounds; the results are the same either way.
+    """
+    if progress_every < 1:
+        raise ValueError("progress_every must be positive")
+    config = job_config(config)
+    sim = make_simulation(config)
+    if progress == None:
+        return job_results(sim.run(n_times=config["rounds"], seed=config["seed"]))
+
+    # play the seeded run on this table in slices
+    start_time = time()
+    _seed_simulation(sim, _worker_seeds(seed=config["seed"], workers=1)[0])
+    rounds = 0
+    progress(rounds)
+    while rounds < config["rounds"]:
+        batch = min(progress_every, config["rounds"] - rounds)
+        sim.run(n_times=batch)
+        rounds += batch
+        progress(rounds)
+    results = SimulationResults(players=sim.players + sim.out_players, n_times=rounds, time_elapsed=time() - start_time)
+    return job_results(results)
+
+def job_results(results) -> dict:
+    players = {}
+    for (name, res) in results.items():
+        players[name] = {
+            "rounds": res.rounds,
+            "hands": res.hands,
+            "won": res.won,
+            "pushed": res.pushed,
+            "busted": res.busted,
+            "net": res.net,
+            "win_rate": res.win_rate,
+            "net_mean": res.net_mean,
+            "net_stderr": res.net_stderr,
+        }
+    return {"players": players, "time_elapsed": results.time_elapsed}
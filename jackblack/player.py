@@ -1,6 +1,7 @@
 from __future__ import annotations
-from .deck import Card, Hand
-from escprint import esc
+import random
+from .deck import Card, Hand, Deck
+from .stats import PlayerStats
 from typing import NamedTuple
 
 HIT = "hit"
@@ -9,12 +10,49 @@ INSURANCE = "insurance"
 DOUBLE_DOWN = "double down"
 SPLIT = "split"
 
+# integer action codes, combined into a bitmask of legal actions
+ACT_STAY = 1
+ACT_HIT = 2
+ACT_DOUBLE_DOWN = 4
+ACT_SPLIT = 8
+ACT_INSURANCE = 16
+
+ACTIONS = {
+    STAY: ACT_STAY,
+    HIT: ACT_HIT,
+    DOUBLE_DOWN: ACT_DOUBLE_DOWN,
+    SPLIT: ACT_SPLIT,
+    INSURANCE: ACT_INSURANCE,
+}
+# every spelling the string API accepts
+DECISION_ACTIONS = {
+    **ACTIONS,
+    "": ACT_STAY, "s": ACT_STAY,
+    "h": ACT_HIT,
+    "dd": ACT_DOUBLE_DOWN,
+    "spl": ACT_SPLIT,
+    "i": ACT_INSURANCE,
+}
+
+def action_choices(legal:int) -> list[str]:
+    """The string ``choices`` list for a bitmask of legal actions."""
+    return list(_CHOICES[legal])
+
+_CHOICES = tuple(
+    tuple(["", STAY, HIT] + [name for (name, action) in ((DOUBLE_DOWN, ACT_DOUBLE_DOWN), (SPLIT, ACT_SPLIT), (INSURANCE, ACT_INSURANCE)) if legal & action])
+    for legal in range(32)
+)
+
 ### STRATEGY ###
 class Strategy:
     log:list
     auto_log:bool
     state_log: list
     state: dict
+    # count systems read from player.deck, the table keeps them (see COUNT_SYSTEMS)
+    counts:tuple[str, ...] = ()
+    # trusted strategies always return a legal action, so nothing is validated
+    trusted:bool = False
 
     def __init__(self, auto_log:bool=True) -> None:
         self.auto_log = auto_log
@@ -59,17 +97,13 @@ class Strategy:
             players=players
         )
 
-        if not decision:
-            decision = STAY
-
-        decision = str.lower(decision)
+        return _check_decision(decision, choices)
 
-        if not isinstance(decision, str):
-            raise TypeError("Strategy decision must be of type str")
-        if decision not in choices:
-            raise ValueError(f"Straregy decision not in list of valid choices: {choices}")
-        
-        return decision
+    def __decide_batch__(self, states:DecisionStates) -> list[str]:
+        decisions = self.decide_batch(states)
+        if len(decisions) != len(states.players):
+            raise ValueError(f"Strategy returned {len(decisions)} decisions for {len(states.players)} hands")
+        return [_check_decision(decision, choices) for (decision, choices) in zip(decisions, states.choices)]
         
     def __after__(self, player:Player, dealer:Dealer=None, players:list[Player]=[]) -> None:
         return self.after(player=player, dealer=dealer, players=players)
@@ -87,9 +121,62 @@ class Strategy:
         # possible choices = ["insurance","split","hit","stay","double down"]
         return STAY
 
+    def decide_batch(self, states:DecisionStates) -> list[str]:
+        # override to answer every pending hand in one call, see DecisionStates
+        return [
+            self.decide(player=player, choices=choices, dealer=states.dealer, players=states.others(k))
+            for (k, (player, choices)) in enumerate(zip(states.players, states.choices))
+        ]
+
+    def decide_action(self, player:Player, legal:int, dealer:Dealer=None, table:list[Player]=[]) -> int:
+        # override with trusted = True to skip strings & validation altogether
+        players = [other for other in table if other != player]
+        return ACTIONS[self.__decide__(player=player, choices=action_choices(legal), dealer=dealer, players=players)]
+
     def after(self, player:Player, dealer:Dealer=None, players:list[Player]=[]) -> None:
         pass
 
+    def batches(self) -> bool:
+        """Whether this strategy implements ``decide_batch``."""
+        return type(self).decide_batch is not Strategy.decide_batch
+
+def _check_decision(decision:str, choices:list[str]) -> str:
+    # the usual case, without building a lowercased copy
+    if decision and decision in choices:
+        return decision
+    if not decision:
+        decision = STAY
+
+    decision = str.lower(decision)
+
+    if not isinstance(decision, str):
+        raise TypeError("Strategy decision must be of type str")
+    if decision not in choices:
+        raise ValueError(f"Straregy decision not in list of valid choices: {choices}")
+
+    return decision
+
+### DECISION STATES
+class DecisionStates(NamedTuple):
+    """
+    Every hand waiting on one strategy's decision, column by column: entry
+    ``k`` of each list belongs to ``players[k]`` (a player or a split /
+    multi-hand pseudo player). A pair can be split when SPLIT is among
+    its choices.
+    """
+    players:list[Player]
+    choices:list[list[str]]
+    values:list[int]
+    soft:list[bool]
+    upcard:int
+    dealer:Dealer
+    table:list[Player]
+
+    def others(self, k:int) -> list[Player]:
+        # what Strategy.decide gets as `players`
+        player = self.players[k]
+        return [other for other in self.table if other != player]
+
 class Simple(Strategy):
     def init_state(self):
         self.state = {
@@ -119,12 +206,17 @@ class Player:
     bet:int
     is_split:bool
     insurance:int
-    pseudos:list[PseudoPlayer]
+    pseudos:list[HandSlot]
     is_pseudo:bool
     is_stayed:bool
+    stats:PlayerStats
+    keep_results:bool
     results:list[PlayerResults]
+    # the deck & random numbers of the table this seat is at, bound when the player sits down
+    deck:Deck = None
+    rng:random.Random = None
 
-    def __init__(self, name:str, chips:int=1000, strategy:Strategy=Simple()) -> None:
+    def __init__(self, name:str, chips:int=1000, strategy:Strategy=Simple(), keep_results:bool=False) -> None:
         self.name = name
         self.strategy = strategy
         self.hand = Hand()
@@ -135,6 +227,13 @@ class Player:
         self.pseudos = []
         self.is_pseudo = False
         self.is_stayed = False
+        # HandSlots no longer in play, reused by splits & extra hands
+        self._slot_pool = []
+        # the hands this player plays when there are no pseudos
+        self._hands = (self,)
+        self.stats = PlayerStats()
+        # per-round PlayerResults are only kept on request
+        self.keep_results = keep_results
         self.results = []
     
     def hit(self, card:Card) -> bool:
@@ -148,7 +247,7 @@ class Player:
         return self.hand.is_blackjack()
     
     def can_split(self) -> bool:
-        return self.hand.len() == 2 and self.hand[0].rank == self.hand[1].rank
+        return self.hand.is_pair()
 
     def hand_value(self) -> int:
         return self.hand.value()
@@ -160,50 +259,18 @@ class Player:
         return list(map(lambda card: card.to_str(), self.hand))
 
     def print(self, max_name_len:int=0, dealer:Dealer=None) -> None:
-        dealer_hand_value = -1 if dealer == None else dealer.hand_value()
-
-        card_str_arr = []
-        for card in self.hand:
-            card_str_arr.append(f"{card.to_str()}")
-
-        pref_len = max_name_len - len(self.name)
-        post_str = ""
-        if pref_len > 0:
-            post_str = " " * pref_len
-        
-        print_style = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Green/bold"
-        print_strike = "strike" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
-        print_hand_style = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Cyan/bold"
-        print_red = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
-        
-        bet_str = f"${self.bet}" if not self.has_insurance() else f"${self.bet} + (${self.insurance})"
-        stayed_check = " ✔︎" if self.is_stayed else ""
-
-        if not self.has_pseudos():
-            esc.printf(
-                (self.name, print_style, print_strike, "underline"), (post_str,print_style), 
-                (" ... ",print_red), (bet_str, print_style, "underline"),
-                (" -> ",print_red), # (f"{post_str + (' '*len(self.name))} ... ", print_style), 
-                (f"{' | '.join(card_str_arr)}", print_hand_style, print_strike),
-                stayed_check
-            )
-        else:
-            print_style = "red" if (self.is_bust() or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Green/bold"
-            print_strike = "strike" if (self.is_bust() or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
-
-            esc.printf(
-                (self.name, print_style, print_strike, "underline"), 
-                (post_str,print_style)," ... ", (bet_str, print_style, "underline/dim"),
-            )
-            for pseudo in self.pseudos:
-                pseudo.print(max_name_len=max_name_len, dealer=dealer)
+        from .render import print_player
+        print_player(self, max_name_len=max_name_len, dealer=dealer)
 
     def reset(self) -> None:
         self.hand.clear()
         self.bet = 0
         self.insurance = 0
         self.is_stayed = False
-        self.pseudos = []
+        # split / extra hands go back to the pool for the next round
+        if self.pseudos:
+            self._slot_pool.extend(self.pseudos)
+            self.pseudos.clear()
 
     def place_bet(self, bet_amount:int, min_bet:int=15) -> int:
         if self.chips < bet_amount:
@@ -223,60 +290,8 @@ class Player:
         self.chips -= bet
 
     def get_init_round_inputs(self, min_bet:int=15) -> None:
-        esc.printf(
-            f"{self.name}, How many hands? ", ("default = 1", "dim")  
-        )
-
-        hand_amount = (
-            esc.input("#", input="Green", end="")
-        )
-        
-        if not hand_amount.isdigit() and hand_amount != "":
-            esc.erase_screen(); esc.cursor_to_top()
-            esc.print("Hand amount must be integer.","Red/italic")
-            return self.get_init_round_inputs(min_bet=min_bet)
-
-        if hand_amount == "":
-            hand_amount = 1
-        else:
-            hand_amount = int(hand_amount)
-
-        esc.printf(
-            f"{self.name} (", [f"${self.chips}", "Green/underline"], 
-            f") What is your bet? ", (f"defualt = ${min_bet}","dim")  
-        )
-
-        bet_amount = (
-            esc.input("$", input="Green", end="")
-        )
-                
-        if not bet_amount.isdigit() and bet_amount != "":
-            esc.erase_screen(); esc.cursor_to_top()
-            esc.print("Bet amount must be integer.","Red/italic")
-            return self.get_init_round_inputs(min_bet=min_bet)
-
-        if bet_amount == "":
-            bet_amount = min_bet
-        else:
-            bet_amount = int(bet_amount)
-
-
-        if (hand_amount * bet_amount > self.chips):
-            esc.erase_screen(); esc.cursor_to_top()
-            esc.print("Bet * Hand Amt. greater than chip count","Red/italic")
-            return self.get_init_round_inputs(min_bet=min_bet)
-        if (bet_amount < min_bet):
-            esc.erase_screen(); esc.cursor_to_top()
-            esc.print("Bet amount lower than Min Bet.","Red/italic")
-            return self.get_init_round_inputs(min_bet=min_bet)
-
-        if hand_amount > 1:
-            for i in range(hand_amount):
-                self.pseudos.append(
-                    PseudoPlayer(name=f"{self.name}", parent=self, bet=bet_amount)
-                )
-        else:
-            self.place_bet(bet_amount=bet_amount, min_bet=min_bet)
+        from .render import input_round
+        input_round(self, min_bet=min_bet)
 
     def has_pseudos(self) -> bool:
         return len(self.pseudos) > 0
@@ -288,59 +303,150 @@ class Player:
         # weed out bad calls
         if not self.can_split():
             return
-        # rest
-        (hand1,hand2) = self.hand.split()
-
+        # the pair becomes two slots, the second one needs its own bet
+        (first, second) = self.hand
         bet = self.bet
         self.bet = 0
-
-        self.pseudos = [
-            PseudoPlayer(self.name, parent=self, bet=bet, hand=hand1),
-            PseudoPlayer(self.name, parent=self, bet=bet, hand=hand2)
-        ]
-        #
-        # self.bet *= 2
+        self.pseudos.append(self._take_slot(first, bet))
+        self.pseudos.append(self._take_slot(second, bet))
+        self.chips += bet
+        # an insured pair stays insured on the first hand, where it's settled
+        self.pseudos[0].insurance = self.insurance
+        self.insurance = 0
 
     def _handle_mult_hands(self, hand_amount:int, bet_amount:int) -> None:
         if hand_amount > 1:
             for i in range(hand_amount):
-                self.pseudos.append(
-                    PseudoPlayer(name=f"{self.name}", parent=self, bet=bet_amount)
-                )
+                self.pseudos.append(self._take_slot(None, bet_amount))
+
+    def _take_slot(self, card:Card|None, bet:int) -> HandSlot:
+        slot = self._slot_pool.pop() if self._slot_pool else HandSlot(self)
+        slot.hand.clear()
+        if card != None:
+            slot.hand.append(card)
+        slot.bet = 0
+        slot.insurance = 0
+        slot.is_stayed = False
+        slot._stake(bet)
+        return slot
+
+### HAND SLOT ###
+class HandSlot:
+    """
+    One of a player's split or extra hands: the bet, the cards and the round
+    flags, nothing else. Slots are taken from the parent's pool and returned
+    to it by ``Player.reset``, so splits and multi-hand rounds reuse them.
+    Strategies get a slot as ``player``; its name, strategy & chips are the
+    parent's.
+    """
+    __slots__ = ("parent", "hand", "bet", "insurance", "is_stayed")
+    is_pseudo = True
+    pseudos = ()
+
+    def __init__(self, parent:Player) -> None:
+        self.parent = parent
+        self.hand = Hand()
+        self.bet = 0
+        self.insurance = 0
+        self.is_stayed = False
+
+    @property
+    def name(self) -> str:
+        return self.parent.name
+
+    @property
+    def strategy(self) -> Strategy:
+        return self.parent.strategy
+
+    @property
+    def chips(self) -> int:
+        return self.parent.chips
+
+    @property
+    def stats(self) -> PlayerStats:
+        return self.parent.stats
+
+    @property
+    def deck(self) -> Deck:
+        return self.parent.deck
+
+    @property
+    def rng(self) -> random.Random:
+        return self.parent.rng
+
+    def hit(self, card:Card) -> bool:
+        self.hand.append(card)
+        return self.hand.is_bust()
+
+    def is_bust(self) -> bool:
+        return self.hand.is_bust()
+
+    def has_blackjack(self) -> bool:
+        return self.hand.is_blackjack()
+
+    def can_split(self) -> bool:
+        return self.hand.is_pair()
+
+    def hand_value(self) -> int:
+        return self.hand.value()
+
+    def lowest_hand_value(self) -> int:
+        return self.hand.lowest_value()
+
+    def card_str_list(self) -> list:
+        return list(map(lambda card: card.to_str(), self.hand))
+
+    def has_pseudos(self) -> bool:
+        return False
+
+    def has_insurance(self) -> bool:
+        return self.insurance > 0
+
+    def place_bet(self, bet_amount:int, min_bet:int=15) -> int:
+        if self.parent.chips < bet_amount:
+            return -2
+        if min_bet > bet_amount:
+            return -1
+        return self._stake(bet_amount)
+
+    def _stake(self, bet_amount:int) -> int:
+        self.bet += bet_amount
+        self.parent.bet += bet_amount
+        self.parent.chips -= bet_amount
+        return self.bet
+
+    def place_insurance_bet(self) -> None:
+        bet = (self.bet / 2)
+        self.insurance = bet
+        self.parent.chips -= bet
+
+    def split_hand(self) -> None:
+        # weed out bad calls
+        if not self.can_split():
+            return
+        # keep the first card here, the second one starts a slot right after this one
+        second = self.hand[1]
+        first = self.hand[0]
+        self.hand.clear()
+        self.hand.append(first)
+        pseudos = self.parent.pseudos
+        pseudos.insert(pseudos.index(self) + 1, self.parent._take_slot(second, self.bet))
+
+    def print(self, max_name_len:int=0, dealer:Dealer=None) -> None:
+        from .render import print_player
+        print_player(self, max_name_len=max_name_len, dealer=dealer)
 
 ### Pseudo PLAYER ###
+# split & extra hands used to be full players; the engine now uses HandSlot
 class PseudoPlayer(Player):
     def __init__(self, name:str, parent:Player, bet:int, hand:Hand=None) -> None: # hand = Hand() causes weird bug
-        super().__init__(name)
+        # split / extra hands are played by the parent's strategy
+        super().__init__(name, strategy=parent.strategy)
         self.parent = parent
         self.hand = hand if hand != None else Hand() # again have to do cause weird bug
         self.is_pseudo = True
         self.place_bet(bet_amount=bet)
     
-    def print(self, max_name_len:int=0, dealer:Dealer=None) -> None:
-        dealer_hand_value = -1 if dealer == None else dealer.hand_value()
-
-        card_str_arr = []
-        for card in self.hand:
-            card_str_arr.append(f"{card.to_str()}")
-
-        pref_len = max_name_len - len(self.name)
-        post_str = ""
-        if pref_len > 0:
-            post_str = " " * pref_len
-        
-        print_style = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Green/bold"
-        print_strike = "strike" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
-        print_red = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
-        print_hand_style = "red" if (self.is_bust() or (dealer_hand_value > self.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Cyan/bold"
-        stayed_check = " ✔︎" if self.is_stayed else ""
-
-        esc.printf(
-            (f"{post_str + (' '*len(self.name))} ... ${self.bet}", print_style, print_strike), 
-            (" -> ",print_red), (f"{' | '.join(card_str_arr)}", print_hand_style, print_strike),
-            stayed_check
-        )
-
     def place_bet(self, bet_amount: int, min_bet: int = 15) -> int:
         if self.parent.chips < bet_amount:
             return -2
@@ -373,23 +479,8 @@ class Dealer(Player):
         super().__init__("Dealer", strategy)
 
     def print(self, hidden=True, max_name_len:int=0) -> None:
-        card_str_arr = []
-        for i in range(len(self.hand)):
-            if hidden and i > 0:
-                card_str_arr.append("*******")
-            else:
-                card_str_arr.append(f"{self.hand[i].to_str()}")
-
-        pref_len = max_name_len - len(self.name)
-        post_str = ""
-        if pref_len > 0:
-            for _ in range(pref_len):
-                post_str+= " "
-
-        esc.printf(
-            (self.name, "red/strikethrough" if self.is_bust() else "Blue/bold/underline"), post_str,
-            (f" ... {' | '.join(card_str_arr)}", "red/strikethrough" if self.is_bust() else "Cyan/bold")
-        )
+        from .render import print_dealer
+        print_dealer(self, hidden=hidden, max_name_len=max_name_len)
 
     def showing(self) -> int:
         if len(self.hand) > 0:
@@ -417,4 +508,6 @@ class PlayerSimulationResults(NamedTuple):
     busted:int
     net:int
     win_rate:float
+    net_mean:float = 0.0
+    net_stderr:float = 0.0
     
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Exact dealer outcome probabilities.
+
+The dealer's draw is enumerated card by card against the remaining shoe
+composition, with every intermediate (composition, hand) state memoized.
+A composition is a tuple of 10 counts: Aces, 2 through 9, then all
+ten-valued cards.
+"""
+from __future__ import annotations
+from typing import NamedTuple
+from .deck import Card
+
+ACE, TEN = 0, 9
+
+class DealerProbabilities(NamedTuple):
+    p17:float
+    p18:float
+    p19:float
+    p20:float
+    p21:float
+    bust:float
+    blackjack:float
+
+def shoe_composition(num_decks:int=8) -> tuple[int, ...]:
+    """Composition of a full shoe."""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+def card_index(card:Card|int) -> int:
+    """Composition index of a card or a ``Card.value`` (Ace = 11)."""
+    value = card.value if isinstance(card, Card) else card
+    return ACE if value in (1, 11) else value - 1
+
+def add_cards(composition:tuple[int, ...], *cards:Card|int) -> tuple[int, ...]:
+    counts = list(composition)
+    for card in cards:
+        counts[card_index(card)] += 1
+    return tuple(counts)
+
+def remove_cards(composition:tuple[int, ...], *cards:Card|int) -> tuple[int, ...]:
+    counts = list(composition)
+    for card in cards:
+        i = card_index(card)
+        if counts[i] == 0:
+            raise ValueError(f"No {card} left in composition {composition}")
+        counts[i] -= 1
+    return tuple(counts)
+
+### DEALER ODDS
+class DealerOdds:
+    """
+    Memoized dealer outcome enumerator for one soft 17 rule. ``memo`` holds
+    the draw distribution of every intermediate dealer state and ``results``
+    the finished ``DealerProbabilities`` by (upcard, composition).
+    """
+    hit_on_soft_17:bool
+    memo:dict
+    results:dict
+
+    def __init__(self, hit_on_soft_17:bool=False) -> None:
+        self.hit_on_soft_17 = hit_on_soft_17
+        self.memo = {}
+        self.results = {}
+
+    def probabilities(self, upcard:Card|int, composition:tuple[int, ...]) -> DealerProbabilities:
+        """
+        Final-total probabilities for ``upcard`` when the hole card and any
+        draws come from ``composition`` (the shoe without the upcard).
+        """
+        up = card_index(upcard)
+        key = (up, composition)
+        result = self.results.get(key)
+        if result != None:
+            return result
+
+        n = sum(composition)
+        if n == 0:
+            raise ValueError("Composition is empty")
+        dist = [0.0] * 6
+        blackjack = 0.0
+        for (hole, count) in enumerate(composition):
+            if count == 0:
+                continue
+            p = count / n
+            if (up == ACE and hole == TEN) or (up == TEN and hole == ACE):
+                blackjack += p
+                continue
+            sub = self._draw(_take(composition, hole), up + hole + 2, up == ACE or hole == ACE)
+            for k in range(6):
+                dist[k] += p * sub[k]
+
+        result = DealerProbabilities(*dist, blackjack)
+        self.results[key] = result
+        return result
+
+    def _draw(self, composition:tuple[int, ...], hard:int, has_ace:bool) -> tuple[float, ...]:
+        # (p17, p18, p19, p20, p21, bust) from this dealer hand onwards
+        soft = has_ace and hard <= 11
+        total = hard + 10 if soft else hard
+        if total > 21:
+            return _BUST
+        if total >= 17 and not (self.hit_on_soft_17 and soft and total == 17):
+            return _STANDS[total - 17]
+
+        key = (composition, hard, has_ace)
+        dist = self.memo.get(key)
+        if dist != None:
+            return dist
+
+        n = sum(composition)
+        if n == 0:
+            raise ValueError("Composition ran out of cards before the dealer finished")
+        dist = [0.0] * 6
+        for (i, count) in enumerate(composition):
+            if count == 0:
+                continue
+            p = count / n
+            sub = self._draw(_take(composition, i), hard + i + 1, has_ace or i == ACE)
+            for k in range(6):
+                dist[k] += p * sub[k]
+        dist = tuple(dist)
+        self.memo[key] = dist
+        return dist
+
+    def clear(self) -> None:
+        self.memo.clear()
+        self.results.clear()
+
+def _take(composition:tuple[int, ...], i:int) -> tuple[int, ...]:
+    return composition[:i] + (composition[i] - 1,) + composition[i + 1:]
+
+_BUST = (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+_STANDS = tuple(tuple(1.0 if k == total else 0.0 for k in range(6)) for total in range(5))
+
+_ODDS = {False: DealerOdds(hit_on_soft_17=False), True: DealerOdds(hit_on_soft_17=True)}
+
+def dealer_probabilities(upcard:Card|int, composition:tuple[int, ...]=None, hit_on_soft_17:bool=False, num_decks:int=8) -> DealerProbabilities:
+    """
+    Exact probabilities of the dealer finishing on 17-21, busting or having
+    blackjack. ``composition`` is the shoe left after the upcard was dealt;
+    when omitted, a full ``num_decks`` shoe minus the upcard is used.
+    Results are cached, so repeated calls are dictionary lookups.
+    """
+    if composition == None:
+        composition = remove_cards(shoe_composition(num_decks), upcard)
+    return _ODDS[bool(hit_on_soft_17)].probabilities(upcard, tuple(composition))
@@ -0,0 +1,125 @@
+"""
+Optional instrumentation for ``Simulation``.
+
+``Simulation.run(profile=True)`` wraps the round phases ``Simulation._start``
+calls and the players' strategy callbacks for the duration of the run, so
+unprofiled runs pay nothing for it.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from time import perf_counter
+
+PHASES = ("reset", "bets", "deal", "decisions", "dealer", "after", "settlement")
+# the Table methods each phase is made of
+PHASE_METHODS = (
+    ("_reset", "reset"),
+    ("_check_player_chips", "reset"),
+    ("_handle_init_round_inputs", "bets"),
+    ("_start_init_hit_round", "deal"),
+    ("_handle_decision_round", "decisions"),
+    ("_start_dealer_hit_round", "dealer"),
+    ("_handle_post_game_strat", "after"),
+    ("_get_results", "settlement"),
+)
+STRATEGY_METHODS = ("decide_hands", "decide_bet", "decide", "decide_action", "decide_batch", "after")
+
+### PROFILE
+class Profile:
+    """
+    Cumulative seconds per round phase (``phases``) and per strategy
+    callback (``strategy_time`` & ``strategy_calls``, keyed like
+    ``"Simple.decide"``). Strategy time is also part of the phase it ran in;
+    a callback or phase that runs inside another one of its kind is only
+    counted once, in the inner one.
+    """
+    phases:dict[str,float]
+    strategy_time:dict[str,float]
+    strategy_calls:dict[str,int]
+    rounds:int
+    time_elapsed:float
+
+    def __init__(self) -> None:
+        self.phases = {phase: 0.0 for phase in PHASES}
+        self.strategy_time = {}
+        self.strategy_calls = {}
+        self.rounds = 0
+        self.time_elapsed = 0.0
+
+    @contextmanager
+    def instrument(self, strategies:list):
+        """Time the callbacks of ``strategies`` until the block exits."""
+        patches = []
+        # time spent in the callbacks running right now, innermost last
+        running = []
+        for strategy in strategies:
+            if any(strategy is other for (other, _, _) in patches):
+                continue
+            for method in STRATEGY_METHODS:
+                key = f"{type(strategy).__name__}.{method}"
+                self.strategy_time.setdefault(key, 0.0)
+                self.strategy_calls.setdefault(key, 0)
+                # instance attributes shadow the class methods the dunder hooks call
+                timed = self._timed(self.strategy_time, key, getattr(strategy, method), running, calls=self.strategy_calls)
+                patches.append(_patch(strategy, method, timed))
+        try:
+            yield self
+        finally:
+            _unpatch(patches)
+
+    @contextmanager
+    def instrument_table(self, table):
+        """Time the round phases ``table`` plays until the block exits."""
+        running = []
+        patches = [
+            _patch(table, method, self._timed(self.phases, phase, getattr(table, method), running))
+            for (method, phase) in PHASE_METHODS
+        ]
+        try:
+            yield self
+        finally:
+            _unpatch(patches)
+
+    def _timed(self, totals:dict[str,float], key:str, method, running:list[float], calls:dict[str,int]=None):
+        def timed(*args, **kwargs):
+            running.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                # nested calls already booked their own time
+                totals[key] += elapsed - running.pop()
+                if running:
+                    running[-1] += elapsed
+                if calls != None:
+                    calls[key] += 1
+        return timed
+
+    def strategy_total(self) -> float:
+        return sum(self.strategy_time.values())
+
+    def engine_time(self) -> float:
+        """Time spent in the phases outside of strategy callbacks."""
+        return sum(self.phases.values()) - self.strategy_total()
+
+    def rounds_per_sec(self) -> float:
+        return self.rounds / self.time_elapsed if self.time_elapsed > 0 else 0.0
+
+    def print(self) -> None:
+        from .render import print_profile
+        print_profile(self)
+
+_MISSING = object()
+
+def _patch(obj, name:str, value) -> tuple:
+    # remember what the instance had under name, if anything
+    patch = (obj, name, obj.__dict__.get(name, _MISSING))
+    setattr(obj, name, value)
+    return patch
+
+def _unpatch(patches:list[tuple]) -> None:
+    for (obj, name, original) in reversed(patches):
+        if original is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
@@ -0,0 +1,241 @@
+"""
+Terminal rendering for games and simulations.
+
+Everything that touches ``escprint`` lives here, on top of the headless
+round engine, so simulations never import or call terminal code.
+"""
+from __future__ import annotations
+from escprint import esc
+from time import sleep, time
+
+### PLAYERS
+def print_player(player, max_name_len:int=0, dealer=None) -> None:
+    dealer_hand_value = -1 if dealer == None else dealer.hand_value()
+
+    card_str_arr = []
+    for card in player.hand:
+        card_str_arr.append(f"{card.to_str()}")
+
+    pref_len = max_name_len - len(player.name)
+    post_str = ""
+    if pref_len > 0:
+        post_str = " " * pref_len
+
+    is_losing = (player.is_bust() or (dealer_hand_value > player.hand_value() and dealer_hand_value < 22) or (dealer_hand_value == 21 and len(dealer.hand) == 2))
+    print_style = "red" if is_losing else "Green/bold"
+    print_strike = "strike" if is_losing else ""
+    print_hand_style = "red" if is_losing else "Cyan/bold"
+    print_red = "red" if is_losing else ""
+    stayed_check = " ✔︎" if player.is_stayed else ""
+
+    if player.is_pseudo:
+        esc.printf(
+            (f"{post_str + (' '*len(player.name))} ... ${player.bet}", print_style, print_strike),
+            (" -> ",print_red), (f"{' | '.join(card_str_arr)}", print_hand_style, print_strike),
+            stayed_check
+        )
+        return
+
+    bet_str = f"${player.bet}" if not player.has_insurance() else f"${player.bet} + (${player.insurance})"
+
+    if not player.has_pseudos():
+        esc.printf(
+            (player.name, print_style, print_strike, "underline"), (post_str,print_style),
+            (" ... ",print_red), (bet_str, print_style, "underline"),
+            (" -> ",print_red),
+            (f"{' | '.join(card_str_arr)}", print_hand_style, print_strike),
+            stayed_check
+        )
+    else:
+        print_style = "red" if (player.is_bust() or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else "Green/bold"
+        print_strike = "strike" if (player.is_bust() or (dealer_hand_value == 21 and len(dealer.hand) == 2)) else ""
+
+        esc.printf(
+            (player.name, print_style, print_strike, "underline"),
+            (post_str,print_style)," ... ", (bet_str, print_style, "underline/dim"),
+        )
+        for pseudo in player.pseudos:
+            print_player(pseudo, max_name_len=max_name_len, dealer=dealer)
+
+def print_dealer(dealer, hidden:bool=True, max_name_len:int=0) -> None:
+    card_str_arr = []
+    for i in range(len(dealer.hand)):
+        if hidden and i > 0:
+            card_str_arr.append("*******")
+        else:
+            card_str_arr.append(f"{dealer.hand[i].to_str()}")
+
+    pref_len = max_name_len - len(dealer.name)
+    post_str = ""
+    if pref_len > 0:
+        post_str = " " * pref_len
+
+    esc.printf(
+        (dealer.name, "red/strikethrough" if dealer.is_bust() else "Blue/bold/underline"), post_str,
+        (f" ... {' | '.join(card_str_arr)}", "red/strikethrough" if dealer.is_bust() else "Cyan/bold")
+    )
+
+def input_round(player, min_bet:int=15) -> None:
+    esc.printf(
+        f"{player.name}, How many hands? ", ("default = 1", "dim")
+    )
+
+    hand_amount = (
+        esc.input("#", input="Green", end="")
+    )
+
+    if not hand_amount.isdigit() and hand_amount != "":
+        esc.erase_screen(); esc.cursor_to_top()
+        esc.print("Hand amount must be integer.","Red/italic")
+        return input_round(player, min_bet=min_bet)
+
+    if hand_amount == "":
+        hand_amount = 1
+    else:
+        hand_amount = int(hand_amount)
+
+    esc.printf(
+        f"{player.name} (", [f"${player.chips}", "Green/underline"],
+        f") What is your bet? ", (f"defualt = ${min_bet}","dim")
+    )
+
+    bet_amount = (
+        esc.input("$", input="Green", end="")
+    )
+
+    if not bet_amount.isdigit() and bet_amount != "":
+        esc.erase_screen(); esc.cursor_to_top()
+        esc.print("Bet amount must be integer.","Red/italic")
+        return input_round(player, min_bet=min_bet)
+
+    if bet_amount == "":
+        bet_amount = min_bet
+    else:
+        bet_amount = int(bet_amount)
+
+    if (hand_amount * bet_amount > player.chips):
+        esc.erase_screen(); esc.cursor_to_top()
+        esc.print("Bet * Hand Amt. greater than chip count","Red/italic")
+        return input_round(player, min_bet=min_bet)
+    if (bet_amount < min_bet):
+        esc.erase_screen(); esc.cursor_to_top()
+        esc.print("Bet amount lower than Min Bet.","Red/italic")
+        return input_round(player, min_bet=min_bet)
+
+    if hand_amount > 1:
+        player._handle_mult_hands(hand_amount=hand_amount, bet_amount=bet_amount)
+    else:
+        player.place_bet(bet_amount=bet_amount, min_bet=min_bet)
+
+### TABLE
+def print_game_state(table, current_player=None, reset:bool=True, dealer=None, game_results=None) -> None:
+    hide_dealer = (dealer == None)
+    if reset:
+        esc.erase_screen()
+        esc.cursor_to_top()
+    mxnmlen = table._get_player_max_name_len()
+    print_dealer(table.dealer, max_name_len=mxnmlen, hidden=hide_dealer)
+    print()
+    for player in table.players:
+        print_player(player, max_name_len=mxnmlen, dealer=dealer)
+        print()
+    if game_results:
+        print_game_results(game_results)
+    print()
+
+def print_exit(table) -> None:
+    for player in table.players + table.out_players:
+        esc.printf(
+            (player.name,"Magenta"), " ended with ",(f"${player.chips}","Magenta"),
+        )
+    print()
+
+def run_verbose(sim, n_times:int=1, wait:float=.01):
+    """Play ``sim`` round by round, drawing the table after every round."""
+    from .engine import SimulationResults
+
+    start_time = time()
+    esc.enable_alt_buffer()
+    esc.cursor_to_top()
+    try:
+        for i in range(n_times):
+            if len(sim.players) < 1:
+                break
+            game_results = sim._start()
+            print_game_state(sim, dealer=sim.dealer, reset=False)
+            print_game_results(game_results)
+            sleep(wait)
+            esc.erase_screen()
+            esc.cursor_to_top()
+    finally:
+        esc.disable_alt_buffer()
+
+    time_elapsed = time() - start_time
+    return SimulationResults(players=sim.players+sim.out_players, n_times=n_times, time_elapsed=time_elapsed)
+
+### RESULTS
+def print_game_results(game_results) -> None:
+    for result in game_results:
+        net = (f"+(${result.net})","Green") if result.net >= 0 else (f"-(${abs(result.net)})","Red")
+        _and = " with " if result.pushed > 0 else ""
+        pushed = (f"{result.pushed}","Magenta") if result.pushed > 0 else ""
+        plshands = " hands pushed." if result.pushed > 0 else ""
+        esc.printf(
+            (f"{result.player.name} ","Magenta"), net, ": ",(f"{result.won}","Magenta"), "/",(f"{result.hands}","Magenta"), " hands won", _and, pushed, plshands
+        )
+
+def print_simulation_results(sim_results) -> None:
+    for name in sim_results:
+        res = sim_results[name]
+        rate_sty = "Red" if res.win_rate < .5 else "Green"
+        net_sty = "Red" if res.net < 0 else "Green"
+        esc.printf(
+            (f"{name}", "Magenta"), " won ",(f"{round(res.win_rate * 100, 2)}%", rate_sty), " of the time with net chip earnings = ",(f"{res.net}",net_sty),
+        )
+        print()
+
+def print_comparison_results(comparison_results) -> None:
+    for name in comparison_results:
+        res = comparison_results[name]
+        if name == comparison_results.baseline:
+            esc.printf((f"{name}", "Magenta"), " (baseline) net/round = ", (f"{round(res.mean, 4)}", "Cyan"), f" ± {round(res.stderr, 4)}")
+            continue
+        diff_sty = "Red" if res.diff < 0 else "Green"
+        esc.printf(
+            (f"{name}", "Magenta"), " net/round = ", (f"{round(res.mean, 4)}", "Cyan"), f" ± {round(res.stderr, 4)}",
+            ", vs baseline ", (f"{round(res.diff, 4)}", diff_sty), f" ± {round(res.diff_stderr, 4)}"
+        )
+    print()
+
+def print_profile(profile) -> None:
+    esc.printf(
+        (f"{profile.rounds}", "Magenta"), " rounds in ", (f"{round(profile.time_elapsed, 3)}s", "Cyan"),
+        " = ", (f"{round(profile.rounds_per_sec())}", "Green"), " rounds/sec"
+    )
+    total = sum(profile.phases.values()) or 1.0
+    for (phase, seconds) in profile.phases.items():
+        esc.printf(f"  {phase:<12}", (f"{seconds:.4f}s", "Cyan"), f" ({round(100 * seconds / total, 1)}%)")
+    for (key, seconds) in profile.strategy_time.items():
+        calls = profile.strategy_calls[key]
+        if calls == 0:
+            continue
+        esc.printf(f"  {key:<24}", (f"{seconds:.4f}s", "Magenta"), f" over {calls} calls")
+    esc.printf("  engine (excl. strategies) ", (f"{profile.engine_time():.4f}s", "Cyan"))
+    print()
+
+def print_sweep_results(sweep_results, names:list[str]=None) -> None:
+    for point in sweep_results:
+        settings = names if names else list(point.config)
+        label = ", ".join(f"{name}={point.config[name]}" for name in settings)
+        cached = " (cached)" if point.cached else ""
+        for (name, res) in point.results["players"].items():
+            net_sty = "Red" if res["net_mean"] < 0 else "Green"
+            esc.printf(
+                (label, "Magenta"), f" {name} net/round = ", (f"{round(res['net_mean'], 4)}", net_sty),
+                f" ± {round(res['net_stderr'], 4)}", cached
+            )
+    print()
+
+def print_log(log) -> None:
+    for item in log:
+        esc.print('~ ' + item[0], item[1])
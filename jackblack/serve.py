@@ -0,0 +1,235 @@
+"""
+Local simulation job service.
+
+``JobServer`` listens on a local TCP port (or a Unix socket) for job
+configs (see ``jackblack.jobs``) and runs them on one process pool that
+stays warm across jobs, so imports and worker start-up are paid once.
+The protocol is JSON lines; every request is answered with a stream of
+events carrying the request's ``id``:
+
+    -> {"id": 1, "job": {"rounds": 100000, "strategy": "basic"}}
+    <- {"id": 1, "event": "queued", "key": "..."}
+    <- {"id": 1, "event": "progress", "rounds": 0, "total": 100000}
+    <- {"id": 1, "event": "progress", "rounds": 10000, "total": 100000}
+       ...
+    <- {"id": 1, "event": "result", "config": {...}, "results": {...}}
+
+Failed jobs end with ``{"event": "error", "error": "..."}`` instead.
+``run_remote`` is a blocking client, usable from notebooks.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from .jobs import job_config, config_key, run_job
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+### WORKERS
+_progress_queue = None
+
+def _init_worker(queue) -> None:
+    global _progress_queue
+    _progress_queue = queue
+
+def _warm_up() -> None:
+    pass
+
+def _run_job(job_id:int, config:dict, progress_every:int) -> dict:
+    return run_job(config, progress=lambda rounds: _progress_queue.put((job_id, rounds)), progress_every=progress_every)
+
+### SERVER
+class JobServer:
+    host:str
+    port:int
+    path:str|None
+    workers:int
+    progress_every:int
+
+    def __init__(self, host:str=HOST, port:int=PORT, path:str=None, workers:int=None, progress_every:int=10000) -> None:
+        if progress_every < 1:
+            raise ValueError("progress_every must be positive")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers if workers != None else (os.cpu_count() or 1)
+        self.progress_every = progress_every
+        self._server = None
+        self._pool = None
+        self._progress = None
+        self._listener = None
+        # progress callbacks of running jobs, by server job id
+        self._jobs:dict[int,Callable[[int], None]] = {}
+        self._job_ids = itertools.count()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context()
+        self._progress = context.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_init_worker, initargs=(self._progress,))
+        # start every worker (and its imports) now rather than on the first job
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_up) for _ in range(self.workers)))
+        self._listener = threading.Thread(target=self._forward_progress, args=(loop,), daemon=True)
+        self._listener.start()
+        if self.path != None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host=self.host, port=self.port)
+            # port 0 picks a free port
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server == None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server != None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool != None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._progress.put(None)
+            self._listener.join()
+
+    async def __aenter__(self) -> JobServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _forward_progress(self, loop:asyncio.AbstractEventLoop) -> None:
+        # worker progress arrives on a process queue, hand it to the event loop
+        while True:
+            item = self._progress.get()
+            if item == None:
+                return
+            loop.call_soon_threadsafe(self._on_progress, *item)
+
+    def _on_progress(self, job_id:int, rounds:int) -> None:
+        callback = self._jobs.get(job_id)
+        if callback != None:
+            callback(rounds)
+
+    async def _handle_client(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        tasks = set()
+
+        def send(message:dict) -> None:
+            if not writer.is_closing():
+                writer.write((json.dumps(message) + "\n").encode())
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    config = job_config(request["job"])
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    send({"id": request_id, "event": "error", "error": f"Bad request: {error}"})
+                    continue
+                task = asyncio.create_task(self._run(request_id, config, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # the client is done sending, finish its jobs
+            await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _run(self, request_id, config:dict, send:Callable[[dict], None]) -> None:
+        job_id = next(self._job_ids)
+        finished = asyncio.Event()
+        send({"id": request_id, "event": "queued", "key": config_key(config)})
+
+        def progress(rounds:int) -> None:
+            send({"id": request_id, "event": "progress", "rounds": rounds, "total": config["rounds"]})
+            if rounds >= config["rounds"]:
+                finished.set()
+
+        self._jobs[job_id] = progress
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._pool, _run_job, job_id, config, self.progress_every)
+        except Exception as error:
+            send({"id": request_id, "event": "error", "error": f"{type(error).__name__}: {error}"})
+        else:
+            # the last progress event can trail the result through the queue
+            try:
+                await asyncio.wait_for(finished.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            send({"id": request_id, "event": "result", "config": config, "results": results})
+        finally:
+            self._jobs.pop(job_id, None)
+
+### CLIENT
+def run_remote(job:dict, host:str=HOST, port:int=PORT, path:str=None, on_progress:Callable[[int, int], None]=None) -> dict:
+    """Run one job on a ``JobServer`` and return its results, blocking until done."""
+    if path != None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+    else:
+        sock = socket.create_connection((host, port))
+    with sock, sock.makefile("rw") as stream:
+        stream.write(json.dumps({"id": 0, "job": job}) + "\n")
+        stream.flush()
+        sock.shutdown(socket.SHUT_WR)
+        for line in stream:
+            event = json.loads(line)
+            if event["event"] == "progress" and on_progress != None:
+                on_progress(event["rounds"], event["total"])
+            elif event["event"] == "result":
+                return event["results"]
+            elif event["event"] == "error":
+                raise RuntimeError(event["error"])
+    raise ConnectionError("Server closed the connection before the job finished")
+
+### CLI
+def _positive_int(text:str) -> int:
+    if text.lstrip("-").isdigit() and int(text) > 0:
+        return int(text)
+    raise argparse.ArgumentTypeError(f"'{text}' is not a positive integer")
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(prog="jackblack serve", description="Serve simulation jobs from a warm process pool")
+    parser.add_argument("--host", default=HOST, help=f"Address to listen on (default: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket instead of a port")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--progress-every", type=_positive_int, default=10000, help="Rounds between progress events (default: 10000)")
+    args = parser.parse_args(argv)
+
+    server = JobServer(host=args.host, port=args.port, path=args.socket, workers=args.workers, progress_every=args.progress_every)
+
+    async def serve() -> None:
+        await server.start()
+        where = args.socket if args.socket != None else f"{server.host}:{server.port}"
+        print(f"Serving jobs on {where} with {server.workers} workers")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,119 @@
+"""
+Constant-memory running statistics.
+"""
+from __future__ import annotations
+from math import sqrt, inf
+from statistics import NormalDist
+
+
+class RunningStats:
+    """
+    Count, mean and variance of a stream of numbers (Welford). Two instances
+    can be merged, so partial results from separate runs combine exactly.
+    """
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n:int=0, mean:float=0.0, m2:float=0.0) -> None:
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x:float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other:RunningStats) -> None:
+        if other.n == 0:
+            return
+        if self.n == 0:
+            (self.n, self.mean, self.m2) = (other.n, other.mean, other.m2)
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    def copy(self) -> RunningStats:
+        return RunningStats(self.n, self.mean, self.m2)
+
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def std(self) -> float:
+        return sqrt(self.variance())
+
+    def stderr(self) -> float:
+        return sqrt(self.variance() / self.n) if self.n > 1 else 0.0
+
+    def half_width(self, confidence:float=0.95) -> float:
+        """Half-width of the normal confidence interval on the mean."""
+        if self.n < 2:
+            return inf
+        return z_score(confidence) * self.stderr()
+
+    def __repr__(self) -> str:
+        return f"RunningStats(n={self.n}, mean={self.mean}, std={self.std()})"
+
+class PlayerStats:
+    """
+    Running totals for one player, updated once per round. Replaces keeping
+    every ``PlayerResults`` around; ``round_net`` tracks the mean and
+    variance of the per-round net.
+    """
+    __slots__ = ("rounds", "hands", "won", "pushed", "busted", "net", "round_net")
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.hands = 0
+        self.won = 0
+        self.pushed = 0
+        self.busted = 0
+        self.net = 0.0
+        self.round_net = RunningStats()
+
+    def add(self, hands:int, won:int, pushed:int, busted:int, net:float) -> None:
+        self.rounds += 1
+        self.hands += hands
+        self.won += won
+        self.pushed += pushed
+        self.busted += busted
+        self.net += net
+        self.round_net.add(net)
+
+    def merge(self, other:PlayerStats) -> None:
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.won += other.won
+        self.pushed += other.pushed
+        self.busted += other.busted
+        self.net += other.net
+        self.round_net.merge(other.round_net)
+
+    def copy(self) -> PlayerStats:
+        stats = PlayerStats()
+        stats.merge(self)
+        return stats
+
+    def win_rate(self) -> float:
+        return self.won / self.hands if self.hands > 0 else 0.0
+
+    def hand_ev(self) -> float:
+        return self.net / self.hands if self.hands > 0 else 0.0
+
+    def hand_ev_half_width(self, confidence:float=0.95) -> float:
+        # per-round interval scaled by the average hands per round
+        if self.hands == 0:
+            return inf
+        return self.round_net.half_width(confidence) * self.rounds / self.hands
+
+    def __repr__(self) -> str:
+        return f"PlayerStats(rounds={self.rounds}, hands={self.hands}, won={self.won}, pushed={self.pushed}, busted={self.busted}, net={self.net})"
+
+def z_score(confidence:float) -> float:
+    """Two-sided normal quantile, e.g. 1.96 for 0.95."""
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
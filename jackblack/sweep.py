@@ -0,0 +1,149 @@
+"""
+Parameter sweeps over job configurations.
+
+A grid of setting values is expanded into one job per combination; jobs
+run on a process pool and each point's aggregated results are cached on
+disk under ``config_key()``, so re-running a sweep only computes points
+that were never run before.
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+from .jobs import STRATEGIES, DEFAULT_CONFIG, job_config, config_key, run_job
+
+CACHE_DIR = ".jackblack-cache"
+
+### SWEEP
+class SweepPoint(NamedTuple):
+    config:dict
+    key:str
+    results:dict
+    cached:bool
+
+class Sweep:
+    grid:dict[str,list]
+    base:dict
+    cache_dir:str|None
+    workers:int
+
+    def __init__(self, grid:dict[str,list], base:dict=None, cache_dir:str|None=CACHE_DIR, workers:int=None) -> None:
+        self.grid = {name: list(values) for (name, values) in grid.items()}
+        self.base = dict(base or {})
+        self.cache_dir = cache_dir
+        self.workers = workers if workers != None else (os.cpu_count() or 1)
+
+    def points(self) -> list[dict]:
+        """Every combination of grid values, as full job configs."""
+        names = list(self.grid)
+        return [
+            job_config(self.base, **dict(zip(names, values)))
+            for values in itertools.product(*(self.grid[name] for name in names))
+        ]
+
+    def run(self) -> SweepResults:
+        configs = self.points()
+        keys = [config_key(config) for config in configs]
+        results = [self._load(key) for key in keys]
+        todo = [k for (k, result) in enumerate(results) if result == None]
+
+        if self.workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo))) as pool:
+                futures = {k: pool.submit(run_job, configs[k]) for k in todo}
+                for (k, future) in futures.items():
+                    results[k] = future.result()
+                    self._save(keys[k], configs[k], results[k])
+        else:
+            for k in todo:
+                results[k] = run_job(configs[k])
+                self._save(keys[k], configs[k], results[k])
+
+        done = set(todo)
+        return SweepResults(
+            SweepPoint(config=configs[k], key=keys[k], results=results[k], cached=k not in done)
+            for k in range(len(configs))
+        )
+
+    ### CACHE
+    def _path(self, key:str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key:str) -> dict|None:
+        if self.cache_dir == None or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key)) as file:
+            return json.load(file)["results"]
+
+    def _save(self, key:str, config:dict, results:dict) -> None:
+        if self.cache_dir == None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"config": config, "results": results}, file)
+        os.replace(tmp_path, self._path(key))
+
+### SWEEP RESULTS
+class SweepResults(list[SweepPoint]):
+    def computed(self) -> int:
+        return sum(not point.cached for point in self)
+
+    def to_json(self) -> list[dict]:
+        return [{"config": point.config, "results": point.results, "cached": point.cached} for point in self]
+
+    def print(self, names:list[str]=None) -> None:
+        from .render import print_sweep_results
+        print_sweep_results(self, names=names)
+
+### CLI
+def _bool(text:str) -> bool:
+    if text.lower() in ("1", "true", "yes", "on"):
+        return True
+    if text.lower() in ("0", "false", "no", "off"):
+        return False
+    raise argparse.ArgumentTypeError(f"'{text}' is not a boolean")
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="jackblack sweep",
+        description="Run a simulation for every combination of the given values, caching each point on disk"
+    )
+    parser.add_argument("--rounds", type=int, nargs="+", default=[DEFAULT_CONFIG["rounds"]], help="Rounds per point")
+    parser.add_argument("--seed", type=int, nargs="+", default=[DEFAULT_CONFIG["seed"]], help="Seeds")
+    parser.add_argument("--min-bet", type=int, nargs="+", default=[DEFAULT_CONFIG["min_bet"]], help="Minimum bets")
+    parser.add_argument("--num-decks", type=int, nargs="+", default=[DEFAULT_CONFIG["num_decks"]], help="Decks per shoe")
+    parser.add_argument("--hit-on-soft-17", type=_bool, nargs="+", default=[DEFAULT_CONFIG["hit_on_soft_17"]], help="Dealer soft 17 rule (true/false)")
+    parser.add_argument("--blackjack-payout", type=float, nargs="+", default=[DEFAULT_CONFIG["blackjack_payout"]], help="Winnings of a natural per unit bet (0.5 pays 3:2)")
+    parser.add_argument("--penetration", type=float, nargs="+", default=[DEFAULT_CONFIG["penetration"]], help="Cut card penetration")
+    parser.add_argument("--players", type=int, nargs="+", default=[DEFAULT_CONFIG["players"]], help="Players at the table")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), nargs="+", default=[DEFAULT_CONFIG["strategy"]], help="Strategies")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"Result cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write cached points")
+    parser.add_argument("--output", default=None, help="Write every point's config and results as JSON here")
+    args = parser.parse_args(argv)
+
+    grid = {
+        "rounds": args.rounds,
+        "seed": args.seed,
+        "min_bet": args.min_bet,
+        "num_decks": args.num_decks,
+        "hit_on_soft_17": args.hit_on_soft_17,
+        "blackjack_payout": args.blackjack_payout,
+        "penetration": args.penetration,
+        "players": args.players,
+        "strategy": args.strategy,
+    }
+    sweep = Sweep(grid, cache_dir=None if args.no_cache else args.cache_dir, workers=args.workers)
+    results = sweep.run()
+    # only show the settings that vary
+    results.print(names=[name for (name, values) in grid.items() if len(values) > 1])
+    print(f"{len(results)} points, {results.computed()} computed, {len(results) - results.computed()} from cache")
+
+    if args.output != None:
+        with open(args.output, "w") as file:
+            json.dump(results.to_json(), file, indent=2)
+    return 0
@@ -15,6 +15,9 @@ setup(
     "escprint==1.0.4",
     "argparse==1.4.0",
     ],  # or read from requirements.txt
+    extras_require={
+        "fast": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "jackblack=jackblack.cli:main",  # if you want a CLI
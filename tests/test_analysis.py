@@ -0,0 +1,35 @@
+from jackblack.analysis import Analyzer
+from jackblack.deck import Card
+from jackblack.player import HIT, STAY, DOUBLE_DOWN, SPLIT
+from jackblack.probability import dealer_probabilities, add_cards
+
+def _cards(*ranks:str) -> list[Card]:
+    return [Card(rank) for rank in ranks]
+
+def test_decisions_on_a_full_shoe():
+    analyzer = Analyzer()
+    assert analyzer.best(_cards("10", "6"), 6) == STAY
+    assert analyzer.best(_cards("10", "6"), 10) == HIT
+    assert analyzer.best(_cards("6", "5"), 6) == DOUBLE_DOWN
+    assert analyzer.best(_cards("9", "9"), 6) == SPLIT
+    values = analyzer.evaluate(_cards("10", "7", "4"), 6)
+    assert set(values) == {STAY}
+
+def test_stand_matches_dealer_probabilities():
+    composition = add_cards((0,) * 10, *_cards("2", "5", "6", "7", "9", "10", "10", "King", "Ace"))
+    values = Analyzer().evaluate(_cards("10", "9"), 7, composition=composition)
+    dealer = dealer_probabilities(7, composition)
+    expected = dealer.bust + dealer.p17 + dealer.p18 - dealer.p20 - dealer.p21 - dealer.blackjack
+    assert abs(values[STAY] - expected) < 1e-12
+
+def test_tables_persist_to_disk(tmp_path):
+    path = str(tmp_path / "analysis.pkl")
+    analyzer = Analyzer(cache_path=path)
+    values = analyzer.evaluate(_cards("10", "2"), 3)
+    analyzer.save()
+
+    warm = Analyzer(cache_path=path)
+    assert len(warm._best) == len(analyzer._best) > 0
+    assert warm.evaluate(_cards("10", "2"), 3) == values
+    # tables for the other soft 17 rule are ignored
+    assert len(Analyzer(hit_on_soft_17=True, cache_path=path)._best) == 0
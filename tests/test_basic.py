@@ -0,0 +1,61 @@
+import pytest
+from jackblack.basic import BasicStrategy, basic_charts
+from jackblack.deck import Hand
+from jackblack.player import Player, Dealer, HIT, STAY, DOUBLE_DOWN, SPLIT
+from jackblack.player import ACT_STAY, ACT_HIT, ACT_DOUBLE_DOWN, ACT_SPLIT, ACTIONS, action_choices
+
+ALL_CHOICES = ["", "stay", "hit", "double down", "split"]
+
+def _decide(strategy:BasicStrategy, cards:list[str], upcard:str, choices:list[str]=ALL_CHOICES) -> str:
+    player = Player("P")
+    player.hand = Hand(*cards)
+    dealer = Dealer()
+    dealer.hand = Hand(upcard, "9")
+    choices = [c for c in choices if c != SPLIT or player.can_split()]
+    return strategy.decide(player=player, choices=choices, dealer=dealer)
+
+def test_hard_soft_and_pair_lookups():
+    strategy = BasicStrategy()
+    assert _decide(strategy, ["10", "6"], "10") == HIT
+    assert _decide(strategy, ["10", "6"], "6") == STAY
+    assert _decide(strategy, ["Ace", "7"], "3") == DOUBLE_DOWN
+    assert _decide(strategy, ["Ace", "7"], "9") == HIT
+    assert _decide(strategy, ["8", "8"], "Ace") == SPLIT
+    assert _decide(strategy, ["5", "5"], "9") == DOUBLE_DOWN
+
+def test_doubles_fall_back_without_the_choice():
+    strategy = BasicStrategy()
+    choices = ["", "stay", "hit"]
+    assert _decide(strategy, ["6", "5"], "6", choices) == HIT
+    assert _decide(strategy, ["Ace", "7"], "4", choices) == STAY
+
+def test_rule_aware_charts():
+    assert _decide(BasicStrategy(num_decks=8), ["6", "5"], "Ace") == HIT
+    assert _decide(BasicStrategy(num_decks=8, hit_on_soft_17=True), ["6", "5"], "Ace") == DOUBLE_DOWN
+    assert _decide(BasicStrategy(num_decks=1), ["6", "2"], "6") == DOUBLE_DOWN
+    assert basic_charts(num_decks=2)["pair"][7][8 - 2] == "P"
+    assert basic_charts(num_decks=8)["pair"][7][8 - 2] == "H"
+
+def test_hit_table_matches_decisions():
+    table = BasicStrategy().hit_table()
+    assert table[0][16][10] and not table[0][16][6]
+    assert table[1][18][9] and not table[1][18][7]
+
+def test_trusted_actions_match_string_decisions():
+    strategy = BasicStrategy()
+    assert strategy.trusted
+    dealer = Dealer()
+    for upcard in ("2", "6", "9", "Ace"):
+        dealer.hand = Hand(upcard, "9")
+        for cards in (["10", "6"], ["Ace", "7"], ["8", "8"], ["5", "6"], ["Ace", "Ace"]):
+            player = Player("P")
+            player.hand = Hand(*cards)
+            legal = ACT_STAY | ACT_HIT | ACT_DOUBLE_DOWN | (ACT_SPLIT if player.can_split() else 0)
+            decision = strategy.decide(player=player, choices=action_choices(legal), dealer=dealer)
+            assert strategy.decide_action(player, legal, dealer) == ACTIONS[decision]
+
+def test_subclasses_changing_decide_are_not_trusted():
+    class Cautious(BasicStrategy):
+        def decide(self, player, choices, dealer=None, players=[]):
+            return STAY
+    assert not Cautious().trusted and not Cautious().batches()
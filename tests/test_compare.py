@@ -0,0 +1,30 @@
+import pytest
+from jackblack.compare import Comparison
+from jackblack.player import Simple, Simple17
+from jackblack.stats import RunningStats
+
+
+def test_running_stats_merge():
+    values = [1.0, -1.0, 0.5, 0.0, -1.0, 2.0, 1.0]
+    whole = RunningStats()
+    left = RunningStats()
+    right = RunningStats()
+    for (i, x) in enumerate(values):
+        whole.add(x)
+        (left if i < 3 else right).add(x)
+    left.merge(right)
+    assert left.n == whole.n
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.variance() == pytest.approx(whole.variance())
+
+def test_identical_strategies_have_zero_difference():
+    results = Comparison([Simple(), Simple()]).run(n_times=200, seed=4)
+    (base, other) = results.values()
+    assert other.diff == 0.0 and other.diff_stderr == 0.0
+    assert base.mean == other.mean
+
+def test_comparison_is_seeded():
+    first = Comparison({"s": Simple(), "s17": Simple17()}).run(n_times=200, seed=9)
+    second = Comparison({"s": Simple(), "s17": Simple17()}).run(n_times=200, seed=9)
+    assert first["s17"].diff == second["s17"].diff
+    assert first["s17"].rounds == 200
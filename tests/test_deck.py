@@ -0,0 +1,149 @@
+import pytest
+from jackblack.deck import Hand, Card, Deck, Shoe, CARDS, COUNT_SYSTEMS, HI_LO, OMEGA_II
+
+
+def test_hand_value():
+    hand = Hand(Card("Ace","hearts"), Card("9", "diamonds"), Card("8","spades"))
+    assert hand.value() == 18
+    hand = Hand(Card("Ace","spades"), Card("Ace","diamonds"), Card("Ace", "hearts"), Card("2", "hearts"))
+    assert hand.value() == 15
+    assert hand.lowest_value() == 5
+    assert hand.is_soft()
+
+def test_hand_blackjack_and_bust():
+    assert Hand("Ace", "King").is_blackjack()
+    assert not Hand("King", "9").is_blackjack()
+    assert not Hand("7", "7", "7").is_blackjack()
+    hand = Hand("King", "Queen")
+    assert not hand.is_bust()
+    hand.add("2")
+    assert hand.is_bust()
+    assert hand.value() == 22
+
+def test_hand_totals_follow_mutation():
+    hand = Hand("Ace", "5")
+    assert hand.value() == 16 and hand.is_soft()
+    hand.add("King")
+    assert hand.value() == 16 and not hand.is_soft()
+    hand.pop()
+    assert hand.value() == 16
+    hand.clear()
+    assert hand.value() == 0 and len(hand) == 0
+    hand += [Card("8"), Card("8")]
+    assert hand.is_pair() and hand.value() == 16
+    (left, right) = hand.split()
+    assert left.value() == 8 and right.value() == 8
+
+def test_hand_copies_keep_their_totals():
+    import copy, pickle
+    hand = Hand("Ace", "King", bet=10)
+    for clone in (copy.copy(hand), copy.deepcopy(hand), pickle.loads(pickle.dumps(hand))):
+        assert [card.code for card in clone] == [card.code for card in hand] and clone is not hand
+        assert clone.value() == 21 and clone.is_blackjack() and clone.bet == 10
+        clone.add("5")
+        assert clone.value() == 16 and hand.value() == 21
+
+def test_hand_list_operators_keep_their_totals():
+    hand = Hand("5", bet=10)
+    hand *= 3
+    assert len(hand) == 3 and hand.value() == 15
+    for combined in (hand + [Card("6")], Hand("5", "6") * 2, 2 * Hand("5", "6"), hand.copy()):
+        assert isinstance(combined, Hand)
+        assert combined.value() == sum(card.value for card in combined)
+    assert (hand + Hand("Ace")).value() == 16 and (hand + Hand("Ace")).bet == 10
+    assert len(hand) == 3
+
+def test_shoe_deals_every_card_once():
+    shoe = Shoe(num_decks=2, seed=7)
+    assert len(shoe) == 104
+    dealt = [shoe.deal() for _ in range(104)]
+    assert shoe.deal() is None
+    assert all(card is CARDS[card.code] for card in dealt)
+    assert sorted(card.code for card in dealt) == sorted(list(range(52)) * 2)
+    shoe.reset()
+    assert len(shoe) == 104
+
+def test_shoe_seed_is_deterministic():
+    first = Shoe(num_decks=8, seed=3)
+    second = Shoe(num_decks=8, seed=3)
+    assert [first.deal() for _ in range(50)] == [second.deal() for _ in range(50)]
+
+def test_counts_follow_dealt_cards():
+    for deck in (Deck(num_decks=2, shuffle=True, counts=COUNT_SYSTEMS), Shoe(num_decks=2, seed=5, counts=COUNT_SYSTEMS)):
+        dealt = [deck.deal() for _ in range(52)]
+        assert deck.running_count() == sum(HI_LO[card.code >> 2] for card in dealt)
+        assert deck.running_count("omega-ii") == sum(OMEGA_II[card.code >> 2] for card in dealt)
+        assert deck.running_count("aces") == sum(card.rank == "Ace" for card in dealt)
+        assert deck.true_count() == deck.running_count()
+        state = deck.getstate()
+        deck.deal()
+        deck.setstate(state)
+        assert deck.running_count() == sum(HI_LO[card.code >> 2] for card in dealt)
+        deck.reset()
+        assert deck.running_count() == 0
+
+def test_counting_is_opt_in():
+    for deck in (Deck(num_decks=2, shuffle=True, burn=3), Shoe(num_decks=2, seed=5, burn=3)):
+        assert deck.counts == {}
+        dealt = [deck.deal() for _ in range(30)]
+        # systems added mid-shoe count the cards already dealt
+        deck.track(["hi-lo"])
+        assert deck.running_count() == sum(HI_LO[card.code >> 2] for card in dealt)
+        dealt.append(deck.deal())
+        assert deck.running_count() == sum(HI_LO[card.code >> 2] for card in dealt)
+
+def test_hole_card_is_counted_when_revealed():
+    for deck in (Deck(num_decks=1, shuffle=True, counts=["hi-lo"]), Shoe(num_decks=1, seed=3, counts=["hi-lo"])):
+        up = deck.deal()
+        hole = deck.deal_hole()
+        assert deck.running_count() == HI_LO[up.code >> 2]
+        # tracking a new system mid-round doesn't peek either
+        deck.track(["aces"])
+        assert deck.running_count("aces") == (up.rank == "Ace")
+        deck.reveal()
+        assert deck.running_count() == HI_LO[up.code >> 2] + HI_LO[hole.code >> 2]
+        assert deck.running_count("aces") == (up.rank == "Ace") + (hole.rank == "Ace")
+
+def test_custom_count_tables():
+    shoe = Shoe(num_decks=1, seed=1, counts={"tens": (0,) * 9 + (1,) * 4})
+    for _ in range(52):
+        shoe.deal()
+    assert shoe.counts == {"tens": 16}
+
+def test_cut_card_reshuffles_between_rounds():
+    shoe = Shoe(num_decks=1, seed=4, penetration=0.5, burn=1, counts=["hi-lo"])
+    assert len(shoe) == 51
+    for _ in range(20):
+        shoe.deal()
+    shoe.prepare_round()
+    assert len(shoe) == 31
+    for _ in range(10):
+        shoe.deal()
+    shoe.prepare_round()
+    assert len(shoe) == 51 and shoe.running_count() == 0
+
+    deck = Deck(num_decks=1, penetration=0.5, burn=1)
+    for _ in range(30):
+        deck.deal()
+    deck.prepare_round()
+    assert len(deck) == 51
+
+def test_continuous_shuffle_returns_discards():
+    shoe = Shoe(num_decks=1, seed=9, continuous=True, counts=["hi-lo"])
+    dealt = [shoe.deal() for _ in range(10)]
+    assert len(set(card.code for card in dealt)) == 10
+    shoe.prepare_round()
+    assert len(shoe) == 52 and shoe.running_count() == 0
+    assert sorted(card.code for card in shoe) == list(range(52))
+
+def test_continuous_shuffle_burns_random_cards_every_round():
+    shoe = Shoe(num_decks=1, seed=1, continuous=True, burn=4)
+    aces = 0
+    for _ in range(200):
+        # the burn stays out of the shoe for the whole round
+        assert len(shoe) == 48 and sum(shoe.composition()) == 48
+        aces += 4 - shoe.composition()[0]
+        shoe.deal()
+        shoe.prepare_round()
+    # about 4/13 of the burned cards are Aces, not all of them
+    assert 20 < aces < 120
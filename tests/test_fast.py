@@ -0,0 +1,120 @@
+import pytest
+np = pytest.importorskip("numpy")
+from jackblack.player import Player, Simple, Simple17, Strategy, HIT
+from jackblack.fast import FastSimulation, MultiTableSimulation, Shoes, policy_table
+
+
+def test_policy_table_thresholds():
+    table = policy_table(Simple())
+    assert table[0, 15, 10] and not table[0, 16, 10]
+    table = policy_table(Simple17())
+    assert table[1, 16, 11] and not table[1, 17, 11]
+
+def test_policy_table_rejects_custom_decide():
+    class Custom(Strategy):
+        def decide(self, player, choices, dealer=None, players=[]):
+            return HIT
+    with pytest.raises(TypeError):
+        policy_table(Custom())
+
+def test_shoes_draw_without_replacement():
+    shoes = Shoes(3, 1, np.random.default_rng(0))
+    rows = np.arange(3)
+    drawn = np.stack([shoes.draw(rows) for _ in range(52)], axis=1)
+    for row in drawn:
+        assert sorted(row.tolist()) == sorted(shoes.cards[0].tolist())
+
+def test_empty_shoes_are_reshuffled():
+    shoes = Shoes(2, 1, np.random.default_rng(1))
+    rows = np.arange(2)
+    drawn = np.stack([shoes.draw(rows) for _ in range(104)], axis=1)
+    # two full shoes in a row, never the last position dealt again
+    for row in drawn:
+        assert sorted(row[:52].tolist()) == sorted(row[52:].tolist()) == sorted(shoes.cards[0].tolist())
+    assert (shoes.pos == 52).all()
+
+def test_fast_simulation_results():
+    players = [Player("A", strategy=Simple()), Player("B", strategy=Simple17())]
+    results = FastSimulation(players, seed=1, batch_size=1000).run(n_times=5000)
+    assert set(results) == {"A", "B"}
+    for name in results:
+        res = results[name]
+        assert res.hands == 5000
+        assert res.won + res.pushed <= res.hands
+        assert 0.3 < res.win_rate < 0.5
+    again = FastSimulation([Player("A", strategy=Simple()), Player("B", strategy=Simple17())], seed=1, batch_size=1000).run(n_times=5000)
+    assert again["A"].net == results["A"].net
+
+def _multi_table(n_tables:int=50, **kwargs) -> MultiTableSimulation:
+    players = [Player("A", chips=0, strategy=Simple()), Player("B", chips=0, strategy=Simple17())]
+    return MultiTableSimulation(players, n_tables=n_tables, seed=3, **kwargs)
+
+def test_multi_table_aggregates_per_table_results():
+    sim = _multi_table()
+    results = sim.run(n_times=40)
+    assert results.won.shape == (2, 50)
+    assert (results.rounds == 40).all()
+    for (seat, name) in enumerate(("A", "B")):
+        res = results[name]
+        assert res.hands == 2000
+        assert res.won == results.won[seat].sum()
+        assert res.net == pytest.approx(results.net[seat].sum())
+        assert res.player.chips == pytest.approx(res.net)
+        table = sim.table_stats(7, seat)
+        assert (table.won, table.net) == (results.won[seat, 7], pytest.approx(results.net[seat, 7]))
+
+    # a second run keeps going from the same shoes & totals
+    again = sim.run(n_times=10)
+    assert again["A"].hands == 2500
+    assert again["A"].player.chips == pytest.approx(again.net[0].sum())
+
+def test_multi_table_merges_into_existing_stats():
+    players = [Player("A", chips=0, strategy=Simple())]
+    FastSimulation(players, seed=1).run(n_times=300)
+    before = players[0].stats.copy()
+    results = MultiTableSimulation(players, n_tables=10, seed=3).run(n_times=20)
+    assert results["A"].hands == before.hands + 200
+    assert players[0].stats.net == pytest.approx(before.net + results.net[0].sum())
+    assert players[0].chips == pytest.approx(players[0].stats.net)
+
+def test_multi_table_is_seeded():
+    first = _multi_table().run(n_times=30)
+    second = _multi_table().run(n_times=30)
+    assert (first.net == second.net).all()
+
+def test_multi_table_shoes_persist_until_the_cut_card():
+    sim = _multi_table(n_tables=20, num_decks=1, penetration=0.5)
+    positions = []
+    for _ in range(20):
+        sim.run(n_times=1)
+        positions.append(sim.shoes.pos.copy())
+    positions = np.array(positions)
+    # cursors advance between rounds and only rewind once past the cut card
+    rewound = positions[1:] < positions[:-1]
+    assert rewound.any() and (~rewound).any()
+    assert (positions[:-1][rewound] >= min(sim.cut, 52 - sim._reserve)).all()
+
+def test_multi_table_rounds_never_run_a_multi_deck_shoe_dry():
+    class AlwaysHit(Strategy):
+        def hit_table(self):
+            return np.ones((2, 22, 12), dtype=bool)
+    players = [Player(name, chips=0, strategy=AlwaysHit()) for name in "ABCDEF"]
+    sim = MultiTableSimulation(players, n_tables=50, num_decks=6, penetration=1.0, seed=3)
+    assert sim._reserve == 22 * 7
+    draw = sim.shoes.draw
+    def checked_draw(rows):
+        # a round may only draw from cards its shoe still holds
+        assert (sim.shoes.pos[rows] < sim.shoes.size).all()
+        return draw(rows)
+    sim.shoes.draw = checked_draw
+    positions = []
+    for _ in range(40):
+        sim.run(n_times=1)
+        positions.append(sim.shoes.pos.copy())
+    # every shoe was played down to the reserve & reshuffled
+    assert (np.diff(np.array(positions), axis=0) < 0).any(axis=0).all()
+
+def test_multi_table_net_matches_single_table_engine():
+    results = _multi_table(n_tables=2000, num_decks=8).run(n_times=50)
+    fast = FastSimulation([Player("A", strategy=Simple())], seed=3).run(n_times=100_000)
+    assert abs(results["A"].net_mean - fast["A"].net_mean) < 4 * (results["A"].net_stderr + fast["A"].net_stderr)
@@ -0,0 +1,85 @@
+import pytest
+from jackblack.game import Simulation
+from jackblack.player import Player, Simple, Simple17, ACT_STAY, ACT_HIT
+from jackblack.basic import BasicStrategy
+from jackblack.deck import Shoe, CARDS
+from jackblack.history import HistoryWriter, read_history
+
+np = pytest.importorskip("numpy")
+
+
+def _simulation() -> Simulation:
+    players = [Player("A", 10**6, strategy=Simple()), Player("B", 10**6, strategy=BasicStrategy(auto_log=False))]
+    return Simulation(players=players, deck=Shoe(num_decks=8))
+
+def test_history_matches_results(tmp_path):
+    sim = _simulation()
+    with HistoryWriter(str(tmp_path / "hist"), chunk_rows=64) as history:
+        results = sim.run(n_times=500, seed=5, history=history)
+    columns = read_history(str(tmp_path / "hist"))
+
+    assert columns.rows == 1000
+    assert columns.rounds == 500
+    assert isinstance(columns["net"], np.memmap)
+    assert list(columns["round"][:4]) == [0, 0, 1, 1]
+    for (seat, name) in enumerate(("A", "B")):
+        rows = columns["seat"] == seat
+        assert columns["net"][rows].sum() == pytest.approx(results.stats[name].net)
+        assert columns["hands"][rows].sum() == results[name].hands
+    assert (columns["cards"] >= 2 * columns["hands"]).all()
+    assert (columns["dealer_cards"] >= 2).all()
+
+def test_recorded_run_plays_the_same_cards(tmp_path):
+    plain = _simulation().run(n_times=300, seed=9)
+    with HistoryWriter(str(tmp_path / "hist")) as history:
+        recorded = _simulation().run(n_times=300, seed=9, history=history)
+    assert {n: (r.hands, r.won, r.net) for (n, r) in plain.items()} == {n: (r.hands, r.won, r.net) for (n, r) in recorded.items()}
+
+def test_history_rows_describe_the_round(tmp_path):
+    sim = Simulation(players=[Player("A", 10**6, strategy=Simple17())], deck=Shoe(num_decks=1))
+    with HistoryWriter(str(tmp_path / "hist")) as history:
+        sim.run(n_times=200, seed=1, history=history)
+    columns = read_history(str(tmp_path / "hist"))
+
+    first = columns["first_card"].astype(int)
+    second = columns["second_card"].astype(int)
+    values = np.array([CARDS[code].value for code in first]) + np.array([CARDS[code].value for code in second])
+    # Simple17 only hits or stays, and always hits below 17 without aces
+    assert set(np.unique(columns["actions"])) <= {0, ACT_STAY, ACT_HIT, ACT_STAY | ACT_HIT}
+    assert ((columns["actions"][values < 12] & ACT_HIT) != 0).all()
+    assert (columns["bet"] == 15).all()
+
+def test_history_is_readable_while_open(tmp_path):
+    history = HistoryWriter(str(tmp_path / "hist"))
+    assert read_history(str(tmp_path / "hist")).rows == 0
+    _simulation().run(n_times=10, history=history)
+    assert read_history(str(tmp_path / "hist")).rows == 20
+    history.close()
+
+def test_history_cant_be_combined_with_workers(tmp_path):
+    with HistoryWriter(str(tmp_path / "hist")) as history:
+        with pytest.raises(ValueError):
+            _simulation().run(n_times=10, workers=2, history=history)
+
+def test_history_restores_the_table_and_describes_flushed_rows(tmp_path):
+    from jackblack.profiling import Profile
+    sim = _simulation()
+    with HistoryWriter(str(tmp_path / "hist"), chunk_rows=7) as history:
+        with Profile().instrument_table(sim):
+            profiled = vars(sim)["_get_results"]
+            with history.instrument(sim):
+                for _ in range(2):
+                    sim._start()
+                history.flush()
+                for _ in range(3):
+                    sim._start()
+                # rows & rounds that aren't flushed stay out of the metadata
+                history._write_meta()
+                meta = read_history(str(tmp_path / "hist"))
+                assert (meta.rows, meta.rounds) == (4, 2)
+            # the profiling patch is put back, not deleted
+            assert vars(sim)["_get_results"] is profiled
+        assert "_get_results" not in vars(sim) and "_handle_player_action" not in vars(sim)
+        # a table can be recorded again
+        sim.run(n_times=3, history=history)
+    assert read_history(str(tmp_path / "hist")).rounds == 8
@@ -0,0 +1,58 @@
+from itertools import permutations
+from jackblack.deck import Deck, Shoe, Hand, Card
+from jackblack.player import Player
+from jackblack.engine import Table
+from jackblack.probability import DealerOdds, dealer_probabilities, shoe_composition, add_cards, remove_cards
+
+def _brute_force(upcard:str, cards:list[str], hit_on_soft_17:bool=False) -> list[float]:
+    # every ordering of the remaining cards is equally likely
+    totals = [0] * 7
+    orders = list(permutations(cards))
+    for order in orders:
+        hand = Hand(upcard)
+        for card in order:
+            if len(hand) == 2 and hand.is_blackjack():
+                break
+            value = hand.value()
+            if value > 17 or (value == 17 and not (hit_on_soft_17 and hand.is_soft())):
+                break
+            hand.append(Card(card))
+        if hand.is_blackjack():
+            totals[6] += 1
+        elif hand.is_bust():
+            totals[5] += 1
+        else:
+            totals[hand.value() - 17] += 1
+    return [t / len(orders) for t in totals]
+
+def test_matches_brute_force_on_a_small_shoe():
+    cards = ["Ace", "2", "3", "5", "6", "6", "10", "King"]
+    composition = add_cards((0,) * 10, *(Card(card) for card in cards))
+    for h17 in (False, True):
+        for upcard in ("6", "Ace", "10"):
+            exact = DealerOdds(hit_on_soft_17=h17).probabilities(Card(upcard), composition)
+            expected = _brute_force(upcard, cards, hit_on_soft_17=h17)
+            assert all(abs(a - b) < 1e-12 for (a, b) in zip(exact, expected))
+
+def test_full_shoe_probabilities():
+    probs = dealer_probabilities(6)
+    assert abs(sum(probs) - 1) < 1e-12
+    assert abs(probs.bust - 0.4229) < 1e-3
+    assert dealer_probabilities(11).blackjack > 0.3
+    # hitting soft 17 turns some dealer 17s into other totals
+    assert dealer_probabilities(6, hit_on_soft_17=True).p17 < probs.p17
+    assert dealer_probabilities(6) is probs
+
+def test_shoe_and_deck_compositions():
+    assert Deck(num_decks=2).composition() == shoe_composition(2)
+    shoe = Shoe(num_decks=1, seed=3)
+    card = shoe.deal()
+    assert shoe.composition() == remove_cards(shoe_composition(1), card)
+
+def test_table_counts_the_hole_card_as_unseen():
+    shoe = Shoe(num_decks=8, seed=1)
+    table = Table(players=[Player("P")], deck=shoe, hit_on_soft_17=True)
+    table.hit_player(table.dealer)
+    table.hit_player(table.dealer)
+    upcard = table.dealer.hand[0]
+    assert table.dealer_probabilities() == dealer_probabilities(upcard, hit_on_soft_17=True)
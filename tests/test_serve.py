@@ -0,0 +1,76 @@
+import asyncio
+import json
+import threading
+import pytest
+from jackblack.jobs import job_config, run_job
+from jackblack.serve import JobServer, run_remote
+
+
+async def _request(port:int, requests:list[dict]) -> list[dict]:
+    (reader, writer) = await asyncio.open_connection("127.0.0.1", port)
+    for request in requests:
+        writer.write((json.dumps(request) + "\n").encode())
+    writer.write_eof()
+    events = [json.loads(line) async for line in reader]
+    writer.close()
+    return events
+
+def test_server_streams_progress_and_results():
+    job = {"rounds": 500, "seed": 2, "strategy": "basic", "players": 2}
+
+    async def scenario():
+        async with JobServer(port=0, workers=2, progress_every=200) as server:
+            events = await _request(server.port, [{"id": "a", "job": job}, {"id": "b", "job": {"rounds": 100, "decks": 2}}])
+            (reader, writer) = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"not json\n")
+            writer.write_eof()
+            events += [json.loads(line) async for line in reader]
+            writer.close()
+            return events
+    events = asyncio.run(scenario())
+
+    a = [event for event in events if event["id"] == "a"]
+    assert [event["event"] for event in a] == ["queued", "progress", "progress", "progress", "progress", "result"]
+    assert [event["rounds"] for event in a if event["event"] == "progress"] == [0, 200, 400, 500]
+    assert a[-1]["results"]["players"] == run_job(job_config(job))["players"]
+    (b,) = [event for event in events if event["id"] == "b"]
+    assert b["event"] == "error"
+    assert events[-1] == {"id": None, "event": "error", "error": events[-1]["error"]}
+
+def test_pool_is_reused_across_clients():
+    async def scenario():
+        async with JobServer(port=0, workers=1) as server:
+            pool = server._pool
+            first = await _request(server.port, [{"id": 1, "job": {"rounds": 50}}])
+            second = await _request(server.port, [{"id": 2, "job": {"rounds": 50}}])
+            assert server._pool is pool
+            return (first[-1], second[-1])
+    (first, second) = asyncio.run(scenario())
+    assert first["results"]["players"] == second["results"]["players"]
+
+def test_blocking_client():
+    loop = asyncio.new_event_loop()
+    server = JobServer(port=0, workers=1, progress_every=100)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        progress = []
+        results = run_remote({"rounds": 300, "seed": 1}, port=server.port, on_progress=lambda rounds, total: progress.append(rounds))
+        assert progress == [0, 100, 200, 300]
+        assert results["players"] == run_job(job_config(rounds=300, seed=1))["players"]
+        with pytest.raises(RuntimeError):
+            run_remote({"strategy": "martingale"}, port=server.port)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+def test_progress_every_must_be_positive():
+    from jackblack.serve import main
+    with pytest.raises(ValueError):
+        run_job({"rounds": 10}, progress=lambda rounds: None, progress_every=0)
+    with pytest.raises(ValueError):
+        JobServer(port=0, progress_every=-1)
+    with pytest.raises(SystemExit):
+        main(["--progress-every", "0"])
@@ -0,0 +1,418 @@
+import pytest
+from jackblack.game import Simulation
+from jackblack.player import Player, HandSlot, Strategy, Simple, Simple17, HIT, STAY, SPLIT, INSURANCE, ACT_STAY, ACT_HIT
+from jackblack.deck import Shoe
+
+
+def _simulation() -> Simulation:
+    players = [Player("A", 10**6, strategy=Simple()), Player("B", 10**6, strategy=Simple17())]
+    return Simulation(players=players, deck=Shoe(num_decks=8))
+
+def _summary(results) -> dict:
+    return {name: (res.hands, res.won, res.pushed, res.busted, res.net) for (name, res) in results.items()}
+
+def test_seeded_run_is_deterministic():
+    first = _simulation().run(n_times=300, seed=11)
+    second = _simulation().run(n_times=300, seed=11)
+    assert _summary(first) == _summary(second)
+
+class _Coin(Simple):
+    # decides on the table's random numbers & remembers how often it played
+    def decide(self, player, choices, dealer=None, players=[]):
+        return HIT if player.hand_value() < 12 or (player.hand_value() < 17 and player.rng.random() < 0.5) else STAY
+
+    def after(self, player, dealer=None, players=[]):
+        self.state["rounds"] = self.state.get("rounds", 0) + 1
+
+def test_seeded_run_keeps_global_random_and_strategy_state():
+    import random
+    random.seed(1)
+    before = random.getstate()
+    (first, second) = (Player("A", 10**6, strategy=_Coin()), Player("A", 10**6, strategy=_Coin()))
+    first_results = Simulation(players=[first], deck=Shoe(num_decks=8)).run(n_times=300, seed=5)
+    assert random.getstate() == before
+    # seeded strategies drawing from player.rng repeat exactly
+    assert _summary(first_results) == _summary(Simulation(players=[second], deck=Shoe(num_decks=8)).run(n_times=300, seed=5))
+    assert first.strategy.state["rounds"] == 300
+
+def test_workers_merge_results():
+    sim = _simulation()
+    results = sim.run(n_times=301, workers=2, seed=3)
+    assert results["A"].rounds == 301
+    assert results["A"].hands == 301
+    assert results["A"].net == sim.players[0].chips - sim.players[0].init_chips
+    assert _summary(results) == _summary(_simulation().run(n_times=301, workers=2, seed=3))
+
+def test_results_are_aggregated_without_keeping_rounds():
+    sim = _simulation()
+    results = sim.run(n_times=200)
+    player = sim.players[0]
+    assert player.results == []
+    assert player.stats.rounds == 200
+    assert results["A"].hands == player.stats.hands
+    assert results["A"].net_mean * 200 == pytest.approx(player.stats.net)
+
+def test_keep_results_opt_in():
+    player = Player("A", 10**6, strategy=Simple(), keep_results=True)
+    Simulation(players=[player], deck=Shoe(num_decks=1)).run(n_times=50)
+    assert len(player.results) == 50
+    assert sum(res.hands for res in player.results) == player.stats.hands
+
+def test_headless_engine_does_not_import_terminal_code():
+    import subprocess, sys
+    code = "import sys, jackblack.engine; from jackblack import Simulation, Player; Simulation([Player('A')]).run(n_times=5); print('escprint' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+def test_strategies_see_the_table_deck():
+    seen = []
+    class Counter(Strategy):
+        counts = ("hi-lo",)
+
+        def decide_bet(self, player, min_bet=15):
+            seen.append(player.deck.running_count())
+            return min_bet
+    shoe = Shoe(num_decks=1, seed=2)
+    sim = Simulation(players=[Player("P", strategy=Counter())], deck=shoe)
+    sim.run(n_times=5)
+    assert sim.players[0].deck is shoe
+    assert any(count != 0 for count in seen)
+
+def test_shared_strategies_see_each_seats_deck():
+    decks = []
+    class Recorder(Strategy):
+        def decide_bet(self, player, min_bet=15):
+            decks.append(player.deck)
+            return min_bet
+    strategy = Recorder()
+    (first, second) = (Shoe(num_decks=1, seed=1), Shoe(num_decks=1, seed=2))
+    first_sim = Simulation(players=[Player("P", strategy=strategy)], deck=first)
+    Simulation(players=[Player("Q", strategy=strategy)], deck=second)
+    first_sim.run(n_times=3)
+    assert decks == [first] * 3
+
+def test_strategies_only_count_cards_in_view():
+    from jackblack.deck import HI_LO
+    seen = []
+    class Counter(Simple):
+        counts = ("hi-lo",)
+
+        def decide(self, player, choices, dealer=None, players=[]):
+            hands = [hand for seat in [player.parent if player.is_pseudo else player] + players for hand in (seat.pseudos or [seat])]
+            visible = [card for hand in hands for card in hand.hand] + [dealer.hand[0]]
+            seen.append(player.deck.running_count() == sum(HI_LO[card.code >> 2] for card in visible))
+            return super().decide(player=player, choices=choices, dealer=dealer, players=players)
+    # a continuous shoe counts from zero every round
+    sim = Simulation(players=[Player("P", 10**6, strategy=Counter()), Player("Q", 10**6)], deck=Shoe(num_decks=1, seed=5, continuous=True))
+    sim.run(n_times=200)
+    assert seen and all(seen)
+
+def test_profiled_run_times_phases_and_strategies():
+    sim = _simulation()
+    results = sim.run(n_times=200, profile=True)
+    profile = results.profile
+    assert profile.rounds == 200
+    assert all(seconds > 0 for seconds in profile.phases.values())
+    assert profile.strategy_calls["Simple.decide_bet"] == 200
+    assert profile.strategy_calls["Simple17.after"] == 200
+    assert 0 < profile.engine_time() < sum(profile.phases.values())
+    assert results.time_elapsed > 0 and results.rounds_per_sec > 0
+    # callbacks are unwrapped afterwards
+    assert "decide" not in vars(sim.players[0].strategy)
+    assert "_start_init_hit_round" not in vars(sim)
+    assert sim.run(n_times=10).profile == None
+
+def test_profiling_restores_patched_methods_and_counts_nested_calls_once():
+    import time
+    class Sleepy(Simple):
+        def decide(self, player, choices, dealer=None, players=[]):
+            time.sleep(0.001)
+            return super().decide(player=player, choices=choices, dealer=dealer, players=players)
+
+        def decide_batch(self, states):
+            return [self.decide(player, choices) for (player, choices) in zip(states.players, states.choices)]
+    strategy = Sleepy()
+    bet = strategy.decide_bet = lambda player, min_bet=15: min_bet
+    sim = Simulation(players=[Player("A", 10**6, strategy=strategy)], deck=Shoe(num_decks=8), steady=True)
+    profile = sim.run(n_times=50, profile=True).profile
+    # decide ran inside decide_batch, and is only booked as decide
+    assert profile.strategy_time["Sleepy.decide_batch"] < profile.strategy_time["Sleepy.decide"]
+    assert profile.strategy_total() <= sum(profile.phases.values())
+    assert strategy.decide_bet is bet
+
+def test_batched_decisions_cover_every_hand():
+    class Batched(Strategy):
+        calls = []
+        def decide_hands(self, player):
+            return 3
+        def decide_batch(self, states):
+            self.calls.append(len(states.players))
+            return [HIT if value < 16 else STAY for value in states.values]
+    strategy = Batched()
+    sim = Simulation(players=[Player("A", 10**6, strategy=strategy), Player("B", 10**6, strategy=strategy)], deck=Shoe(num_decks=8, seed=1))
+    results = sim.run(n_times=200)
+    assert results["A"].hands == results["B"].hands == 600
+    # both players' pseudo hands are decided together
+    assert max(Batched.calls) == 6
+    for player in sim.players:
+        assert all(pseudo.is_bust() or pseudo.hand_value() >= 16 or pseudo.has_blackjack() for pseudo in player.pseudos)
+
+class _BatchedSimple(Strategy):
+    def decide_batch(self, states):
+        return [HIT if value < 16 else STAY for value in states.values]
+
+def test_a_batching_seat_does_not_reorder_the_others():
+    def play(strategy):
+        players = [Player("A", 10**6, strategy=Simple17()), Player("B", 10**6, strategy=strategy)]
+        return Simulation(players=players, deck=Shoe(num_decks=8)).run(n_times=500, seed=12)
+    assert _summary(play(_BatchedSimple())) == _summary(play(Simple()))
+
+def test_untrusted_decisions_are_still_validated():
+    class Cheater(Strategy):
+        def decide(self, player, choices, dealer=None, players=[]):
+            return SPLIT
+    sim = Simulation(players=[Player("A", strategy=Cheater())], deck=Shoe(num_decks=1, seed=4))
+    with pytest.raises(ValueError):
+        sim.run(n_times=50)
+
+def test_trusted_strategies_act_through_codes():
+    class Stand(Strategy):
+        trusted = True
+        def decide_action(self, player, legal, dealer=None, table=[]):
+            assert legal & ACT_STAY and legal & ACT_HIT
+            return ACT_STAY
+    sim = Simulation(players=[Player("A", 10**6, strategy=Stand())], deck=Shoe(num_decks=8, seed=1))
+    results = sim.run(n_times=100)
+    assert results["A"].busted == 0
+
+def test_run_until_converged():
+    results = _simulation().run(target=1.0, check_every=500, seed=2)
+    assert results.converged
+    assert results.n_times % 500 == 0 and results["A"].rounds == results.n_times
+    assert all(width <= 1.0 for width in results.half_widths.values())
+
+    results = _simulation().run(target=1e-3, check_every=500, max_rounds=1200)
+    assert not results.converged and results.n_times == 1200
+
+def test_a_table_everyone_left_has_not_converged():
+    results = Simulation([Player("A", 100)], Shoe(num_decks=8)).run(target=1e-6, check_every=1000, seed=1)
+    assert not results.converged and results.half_widths["A"] > 1e-6
+
+def test_converged_run_deals_like_the_seeded_run():
+    # a target every first batch meets stops after exactly check_every rounds
+    converged = _simulation().run(target=10.0, check_every=300, seed=11)
+    assert converged.converged and converged.n_times == 300
+    assert _summary(converged) == _summary(_simulation().run(n_times=300, seed=11))
+
+class _Progression(Simple):
+    # bets more after losses, so chips & state feed back into the rounds
+    def init_state(self):
+        self.state = {"losses": 0}
+
+    def decide_bet(self, player, min_bet=15):
+        return min_bet * (1 + min(self.state["losses"], 3))
+
+    def after(self, player, dealer=None, players=[]):
+        self.state["losses"] = self.state["losses"] + 1 if player.hand_value() < dealer.hand_value() <= 21 else 0
+
+def _checkpoint_simulation(continuous:bool=False) -> Simulation:
+    players = [Player("A", 5000, strategy=_Progression(auto_log=False)), Player("B", 10**6, strategy=Simple17(auto_log=False))]
+    return Simulation(players=players, deck=Shoe(num_decks=2, penetration=0.75, continuous=continuous))
+
+def _full_summary(results) -> dict:
+    return {name: (res.hands, res.won, res.pushed, res.busted, res.net, res.net_mean) for (name, res) in results.items()}
+
+@pytest.mark.parametrize("continuous", [False, True])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, continuous):
+    path = str(tmp_path / "run.ckpt")
+    whole = _checkpoint_simulation(continuous).run(n_times=900, seed=4, checkpoint=str(tmp_path / "whole.ckpt"), checkpoint_every=100)
+
+    # "preempted" after 400 rounds, then picked up by a fresh process
+    _checkpoint_simulation(continuous).run(n_times=400, seed=4, checkpoint=path, checkpoint_every=100)
+    sim = _checkpoint_simulation(continuous)
+    resumed = sim.run(n_times=900, resume=path, checkpoint_every=100)
+
+    assert _full_summary(resumed) == _full_summary(whole)
+    assert sim.players[0].strategy.state == whole.players[0].strategy.state
+
+def test_checkpointed_run_matches_plain_seeded_run(tmp_path):
+    plain = _checkpoint_simulation().run(n_times=500, seed=8)
+    checkpointed = _checkpoint_simulation().run(n_times=500, seed=8, checkpoint=str(tmp_path / "run.ckpt"), checkpoint_every=128)
+    assert _full_summary(checkpointed) == _full_summary(plain)
+
+def test_checkpoint_counts_only_rounds_played(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    player = Player("A", chips=60, strategy=Simple(auto_log=False))
+    sim = Simulation(players=[player], deck=Shoe(num_decks=8))
+    sim.run(n_times=5000, seed=2, checkpoint=path, checkpoint_every=5000)
+    assert sim.players == [] and player.stats.rounds < 5000
+    assert sim.load_checkpoint(path) == player.stats.rounds
+
+def test_checkpoint_must_match_players(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    _checkpoint_simulation().run(n_times=10, checkpoint=path)
+    sim = Simulation(players=[Player("C", 1000)], deck=Shoe(num_decks=2))
+    with pytest.raises(ValueError):
+        sim.run(n_times=20, resume=path)
+
+def test_dealer_hits_soft_17_only_when_the_table_says_so():
+    from jackblack.deck import Hand
+    for (cards, h17, hits) in ((("Ace", "6"), True, True), (("Ace", "6"), False, False), (("Ace", "7"), True, False), (("10", "7"), True, False)):
+        sim = Simulation(players=[Player("A")], deck=Shoe(num_decks=1, seed=1), hit_on_soft_17=h17)
+        sim.dealer.hand = Hand(*cards)
+        sim._start_dealer_hit_round()
+        assert (len(sim.dealer.hand) > 2) == hits
+
+def test_natural_against_dealer_natural_returns_the_bet():
+    from jackblack.deck import Hand
+    player = Player("A", 1000)
+    sim = Simulation(players=[player], deck=Shoe(num_decks=1, seed=1))
+    player.place_bet(20, min_bet=10)
+    (player.hand, sim.dealer.hand) = (Hand("Ace", "King"), Hand("Ace", "Queen"))
+    (res,) = sim._get_results()
+    assert (res.pushed, res.net, player.chips) == (1, 0, 1000)
+
+def test_payout_table_follows_settlement_rules():
+    from jackblack.engine import payout_table, BUST, NATURAL
+    table = payout_table(0.5)
+    assert table[20][BUST] == (0, -1, 0, 0, 1)
+    assert table[BUST][18] == (2, 1, 1, 0, 0)
+    # no peek: a natural beats a bust dealer at even money
+    assert table[BUST][NATURAL] == (2, 1, 1, 0, 0)
+    assert table[NATURAL][NATURAL] == (1, 0, 0, 1, 0)
+    assert table[NATURAL][21] == (0, -1, 0, 0, 0)
+    assert table[21][NATURAL] == (1.5, 0.5, 1, 0, 0)
+    assert table[18][18] == (1, 0, 0, 1, 0)
+    assert table[17][18] == (2, 1, 1, 0, 0)
+    assert table[19][18] == (0, -1, 0, 0, 0)
+    assert payout_table(1.2)[17][NATURAL] == (2.2, 1.2, 1, 0, 0)
+
+def test_blackjack_payout_is_configurable():
+    from jackblack.deck import Hand, Card
+    sim = Simulation(players=[Player("A", 1000)], deck=Shoe(num_decks=1), blackjack_payout=1.2)
+    player = sim.players[0]
+    player.place_bet(10, min_bet=10)
+    player.hand = Hand(Card("Ace"), Card("King"))
+    sim.dealer.hand = Hand(Card("10"), Card("8"))
+    (res,) = sim._get_results()
+    assert (res.won, res.net) == (1, 12.0)
+    assert player.chips == 1012.0
+
+def test_split_hand_losses_count_against_net():
+    from jackblack.deck import Hand, Card
+    sim = Simulation(players=[Player("A", 1000)], deck=Shoe(num_decks=1))
+    player = sim.players[0]
+    player.place_bet(10, min_bet=10)
+    player.hand = Hand(Card("10"), Card("10"))
+    player.split_hand()
+    (first, second) = player.pseudos
+    (first.hand, second.hand) = (Hand(Card("10"), Card("8")), Hand(Card("10"), Card("King")))
+    sim.dealer.hand = Hand(Card("10"), Card("9"))
+    (res,) = sim._get_results()
+    assert (res.hands, res.won, res.net) == (2, 1, 0)
+
+class _SplitEverything(Simple):
+    def decide_hands(self, player):
+        return 2
+
+    def decide(self, player, choices, dealer=None, players=[]):
+        if INSURANCE in choices:
+            return INSURANCE
+        if SPLIT in choices:
+            return SPLIT
+        return super().decide(player=player, choices=choices, dealer=dealer, players=players)
+
+def test_hand_slots_are_reused_between_rounds():
+    player = Player("A", 10**6, strategy=_SplitEverything(auto_log=False))
+    sim = Simulation(players=[player], deck=Shoe(num_decks=2))
+    sim.run(n_times=1)
+    slots = {id(slot) for slot in player.pseudos}
+    seen = set(slots)
+    for _ in range(50):
+        sim.run(n_times=1)
+        seen |= {id(slot) for slot in player.pseudos}
+    # only as many slots as the busiest round needed
+    assert len(seen) == len(player.pseudos) + len(player._slot_pool)
+    slot = player.pseudos[0]
+    assert isinstance(slot, HandSlot)
+    assert (slot.name, slot.strategy, slot.chips) == ("A", player.strategy, player.chips)
+
+def test_split_stakes_one_more_bet():
+    from jackblack.deck import Hand, Card
+    player = Player("A", 1000)
+    player.place_bet(20)
+    player.hand = Hand(Card("8"), Card("8", "hearts"))
+    player.split_hand()
+    assert player.chips == 960 and player.bet == 40
+    (first, second) = player.pseudos
+    first.hit(Card("8", "clubs"))
+    first.split_hand()
+    assert len(player.pseudos) == 3 and player.pseudos[0] is first
+    assert [len(slot.hand) for slot in player.pseudos] == [1, 1, 1]
+    assert player.chips == 940 and player.bet == 60
+
+def test_chips_match_net_with_splits_and_insurance():
+    players = [Player("A", 10**6, strategy=_SplitEverything(auto_log=False)), Player("B", 10**6, strategy=Simple())]
+    results = Simulation(players=players, deck=Shoe(num_decks=2)).run(n_times=3000, seed=6)
+    for (name, res) in results.items():
+        assert res.net == results.stats[name].net
+
+def _steady_simulation(steady:bool, auto_log:bool=False) -> Simulation:
+    players = [
+        Player("A", 10**9, strategy=Simple(auto_log=auto_log)),
+        Player("B", 10**9, strategy=_SplitEverything(auto_log=auto_log)),
+        Player("C", 10**9, strategy=Simple17(auto_log=auto_log)),
+    ]
+    return Simulation(players=players, deck=Shoe(num_decks=8), steady=steady)
+
+def test_steady_run_matches_plain_run():
+    assert _full_summary(_steady_simulation(True).run(n_times=2000, seed=4)) == _full_summary(_steady_simulation(False).run(n_times=2000, seed=4))
+
+def test_steady_run_keeps_only_the_current_round_logged():
+    sim = _steady_simulation(True, auto_log=True)
+    sim.run(n_times=500)
+    assert all(len(player.strategy.log) <= 8 for player in sim.players)
+
+def _round_allocations(sim:Simulation, rounds:int=2000) -> tuple[float, float, int]:
+    import gc, sys, tracemalloc
+    # warm up the slot pools & cached lists on this very table
+    for _ in range(rounds):
+        sim._start()
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for _ in range(rounds):
+        sim._start()
+    blocks = (sys.getallocatedblocks() - blocks) / rounds
+    # bytes a round needs at its busiest, above what it started with
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(rounds):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            sim._start()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return (blocks, sum(peaks) / rounds, max(peaks))
+
+def test_steady_rounds_stay_within_allocation_budget():
+    (blocks, mean_peak, max_peak) = _round_allocations(_steady_simulation(True))
+    # nothing is left allocated round over round
+    assert blocks < 0.05
+    # and a round's scratch space stays small, smaller than without reuse
+    assert max_peak < 4 * 1024
+    assert mean_peak < _round_allocations(_steady_simulation(False))[1]
+
+class _InsureThenSplit(Simple):
+    def decide(self, player, choices, dealer=None, players=[]):
+        if INSURANCE in choices and not player.is_pseudo:
+            return INSURANCE
+        if SPLIT in choices:
+            return SPLIT
+        return super().decide(player=player, choices=choices, dealer=dealer, players=players)
+
+def test_insurance_is_settled_after_a_split():
+    player = Player("A", 10**6, strategy=_InsureThenSplit(auto_log=False))
+    results = Simulation(players=[player], deck=Shoe(num_decks=2)).run(n_times=20000, seed=8)
+    assert results["A"].net == results.stats["A"].net
@@ -0,0 +1,40 @@
+import os
+import pytest
+from jackblack.jobs import job_config, config_key, run_job
+from jackblack.sweep import Sweep
+
+
+def test_job_is_deterministic():
+    config = job_config(rounds=200, seed=4, strategy="basic")
+    assert run_job(config)["players"] == run_job(config)["players"]
+
+def test_config_key_covers_every_setting():
+    assert config_key({"rounds": 100}) == config_key(job_config(rounds=100))
+    assert config_key({"rounds": 100}) != config_key({"rounds": 100, "seed": 1})
+    assert config_key({"strategy_params": {}}) != config_key({"strategy_params": {"auto_log": True}})
+
+def test_unknown_settings_are_rejected():
+    with pytest.raises(ValueError):
+        job_config(decks=2)
+    with pytest.raises(ValueError):
+        job_config(strategy="martingale")
+
+def test_grid_expansion():
+    sweep = Sweep({"num_decks": [1, 2], "hit_on_soft_17": [False, True], "players": [1, 3]}, base={"rounds": 10})
+    points = sweep.points()
+    assert len(points) == 8
+    assert all(point["rounds"] == 10 for point in points)
+    assert {(p["num_decks"], p["hit_on_soft_17"], p["players"]) for p in points} == {
+        (d, h, n) for d in (1, 2) for h in (False, True) for n in (1, 3)
+    }
+
+def test_rerun_only_computes_new_points(tmp_path):
+    base = {"rounds": 100, "seed": 2}
+    first = Sweep({"num_decks": [1, 2]}, base=base, cache_dir=str(tmp_path), workers=1).run()
+    assert first.computed() == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+    second = Sweep({"num_decks": [1, 2, 6]}, base=base, cache_dir=str(tmp_path), workers=2).run()
+    assert [point.cached for point in second] == [True, True, False]
+    assert second[0].results == first[0].results
+    assert second[2].results["players"] == run_job(job_config(base, num_decks=6))["players"]